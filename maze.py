@@ -1,8 +1,22 @@
 import pygame
 import sys
+import random
+import argparse
+import math
+import time
+import numpy as np
 from dataclasses import dataclass, field
 from typing import List, Optional
 from collections import deque
+from maze_solvers import SOLVERS, SolverThread, path_to_moves, solve_astar
+from maze_history import ExplorationHistory
+from maze_cells import CellSet
+from maze_distance import DistanceField
+from maze_replan import LifelongPlanner
+from maze_generator import generate_maze
+from maze_render import PixelMazeRenderer, Camera, GridImage, heatmap_rgb, WALL, OPEN, VISITED, FRONTIER, PATH, START, END
+from maze_tree import tidy_layout
+from maze_segments import label_segments, segment_palette
 
 @dataclass
 class Node:
@@ -16,20 +30,15 @@ class Node:
     children: List["Node"] = field(default_factory=list)
     is_start: bool = False
     is_end: bool = False
-
-@dataclass
-class Tile:
-    xpos: int
-    ypos: int
-    color: tuple[int, int, int]
+    # kept out of eq/repr, which would otherwise recurse back up the tree
+    parent: Optional["Node"] = field(default=None, repr=False, compare=False)
 
 pygame.init()
 
 # Constants
 WINDOW_WIDTH = 1200  # Increased width to fit tree
 WINDOW_HEIGHT = 600
-GRID_SIZE = 15     # Number of rows and columns in the maze
-CELL_SIZE = WINDOW_HEIGHT // GRID_SIZE  # Size of each cell
+GRID_SIZE = 15     # Number of rows and columns in the maze (replaced for generated mazes)
 TREE_X_OFFSET = (WINDOW_HEIGHT+WINDOW_WIDTH)//2  # Offset for tree visualization
 TREE_NODE_RADIUS = 10
 TREE_NODE_OFFSET = 6  # this is a multiplier to space the tree out vertically.
@@ -48,6 +57,31 @@ BUTTON_X_PAUSE = WINDOW_WIDTH - 3*BUTTON_WIDTH - 60 #position next to the reset
 BUTTON_Y_PAUSE = WINDOW_HEIGHT - BUTTON_HEIGHT - 20
 BUTTON_X_STEP = WINDOW_WIDTH - 2*BUTTON_WIDTH -40
 BUTTON_Y_STEP = WINDOW_HEIGHT - BUTTON_HEIGHT - 80
+BUTTON_X_ASTAR = WINDOW_WIDTH - 3*BUTTON_WIDTH - 60 #position next to the step button
+BUTTON_Y_ASTAR = WINDOW_HEIGHT - BUTTON_HEIGHT - 80
+BUTTON_X_DIJKSTRA = WINDOW_WIDTH - 3*BUTTON_WIDTH - 60 #row above the A* button
+BUTTON_Y_DIJKSTRA = WINDOW_HEIGHT - BUTTON_HEIGHT - 140
+BUTTON_X_BIBFS = WINDOW_WIDTH - 2*BUTTON_WIDTH - 40
+BUTTON_Y_BIBFS = WINDOW_HEIGHT - BUTTON_HEIGHT - 140
+BUTTON_X_JPS = WINDOW_WIDTH - BUTTON_WIDTH - 20
+BUTTON_Y_JPS = WINDOW_HEIGHT - BUTTON_HEIGHT - 140
+
+# Seek bar for jumping to any step of the exploration
+SEEK_BAR_X = WINDOW_HEIGHT + 20
+SEEK_BAR_Y = BUTTON_Y_JPS - 30
+SEEK_BAR_WIDTH = WINDOW_WIDTH - WINDOW_HEIGHT - 40
+SEEK_BAR_HEIGHT = 12
+
+# Timing: the loop runs at FPS and the solve advances by the time each frame took, so input
+# is read every frame whatever the speed
+FPS = 60
+MAX_FRAME_TIME = 0.25  # longer frames (window dragged, slow draw) are not caught up on
+SOLVE_SPEEDS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 60000, 150000, 300000]  # steps per second
+DEFAULT_SOLVE_SPEED = 2  # index into SOLVE_SPEEDS
+STEP_TIME_BUDGET = 0.012  # most seconds per frame spent on solve steps, the rest is dropped
+PATH_PAUSE = 0.5  # seconds between the end of the exploration and following the path
+PLAYER_MOVE_INTERVAL = 0.1  # seconds between moves while an arrow key is held
+RECEIVE_TIME_BUDGET = 0.004  # most seconds per frame spent recording steps from the solver thread
 
 BUTTON_COLOR = (100, 100, 200)
 BUTTON_HOVER_COLOR = (120, 120, 220)
@@ -57,6 +91,10 @@ BUTTON_TEXT_DFS = "Solve DFS"
 BUTTON_TEXT_RESET = "Reset Maze"
 BUTTON_TEXT_PAUSE = "Pause/Play Solve"
 BUTTON_TEXT_STEP = "Step Solve"
+BUTTON_TEXT_ASTAR = "Solve A*"
+BUTTON_TEXT_DIJKSTRA = "Solve Dijkstra"
+BUTTON_TEXT_BIBFS = "Solve BiBFS"
+BUTTON_TEXT_JPS = "Solve JPS"
 DFS_STACK_TEXT = "visit()"
 small_font = pygame.font.SysFont('Arial', 20)
 
@@ -73,48 +111,6 @@ PURPLE = (128, 0, 128)  # Right move
 ORANGE = (255, 165, 0)  # For visited cells during BFS/DFS
 LIGHT_BLUE = (173, 216, 230)  # For frontier cells
 
-COLORS = {
-    (0, 255, 0),      # Green
-    (0, 0, 255),      # Blue
-    (255, 255, 0),    # Yellow
-    (255, 165, 0),    # Orange
-    (128, 0, 128),    # Purple
-    (0, 255, 255),    # Cyan
-    (255, 0, 255),    # Magenta
-    (173, 255, 47),   # Green Yellow
-    (255, 105, 180),  # Hot Pink
-    (75, 0, 130),     # Indigo
-    (0, 128, 128),    # Teal
-    (255, 20, 147),   # Deep Pink
-    (138, 43, 226),   # Blue Violet
-    (34, 139, 34),    # Forest Green
-    (255, 140, 0),    # Dark Orange
-    (186, 85, 211),   # Medium Orchid
-    (70, 130, 180),   # Steel Blue
-    (240, 128, 128),  # Light Coral
-    (154, 205, 50),   # Yellow Green
-    (199, 21, 133),   # Medium Violet Red
-    (218, 112, 214),  # Orchid
-    (0, 206, 209),    # Dark Turquoise
-    (205, 92, 92),    # Indian Red
-    (30, 144, 255),   # Dodger Blue
-    (127, 255, 0),    # Chartreuse
-    (233, 150, 122),  # Dark Salmon
-    (139, 69, 19),    # Saddle Brown
-    (210, 105, 30),   # Chocolate
-    (255, 99, 71)     # Tomato
-}
-
-used_colors = set()
-
-def get_unique_color():
-    global COLORS
-    if not COLORS:
-        raise ValueError("No more unique colors available!")
-    color = COLORS.pop()  # Remove and return a random color
-    used_colors.add(color)
-    return color
-
 # Maze array (1s are walls, 0s are paths)
 maze = [
     [1, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
@@ -134,197 +130,118 @@ maze = [
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 1]
 ]
 
-tile_map = {}  # is a dictionary that goes from a location to a tile, with it's color and corresponding tree node
-node_map = {}  # is a dictionary that goes from a location to a node
+# python maze.py --size N [--seed S] solves a randomly generated N x N maze instead
+parser = argparse.ArgumentParser(description="Maze solver visualization")
+parser.add_argument("--size", type=int, help="generate a random maze with this many rows and columns")
+parser.add_argument("--seed", type=int, help="random seed for the generated maze")
+parser.add_argument("--workers", type=int, default=1, help="worker processes for the distance heatmap of huge mazes")
+args = parser.parse_args()
+if args.size:
+    maze = generate_maze(args.size, args.seed)
+    GRID_SIZE = len(maze)
+CELL_SIZE = WINDOW_HEIGHT // GRID_SIZE  # Size of each cell
+# once cells would be smaller than this, the maze is drawn one pixel per cell instead of one rect per cell
+MIN_RECT_CELL_SIZE = 2
 
 # Define start and end positions
 start_pos = [0, 1]
 end_pos = [GRID_SIZE - 1, GRID_SIZE - 2]  # Based on the maze layout
 
-# count number of neighbors for each location in the maze
-neighbor_count = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-for i in range(GRID_SIZE):
-    for j in range(GRID_SIZE):
-        if maze[i][j] == 0:
-            # we have a valid empty space we check its top neighbor
-            if i > 0 and maze[i-1][j] == 0:
-                neighbor_count[i][j] += 1
-            # now left neighbor
-            if j > 0 and maze[i][j-1] == 0:
-                neighbor_count[i][j] += 1
-            # now below neighbor
-            if i < GRID_SIZE - 1 and maze[i+1][j] == 0:
-                neighbor_count[i][j] += 1
-            # now right neighbor
-            if j < GRID_SIZE - 1 and maze[i][j+1] == 0:
-                neighbor_count[i][j] += 1
-
-# printing neighbor_count out
-# for row in neighbor_count:
-#     print(row)
-
 # starting position
 player_pos = [0, 1]
 original_player_pos = [0, 1]  # Store the original position for reset
 
-def add_tile(xpos: int, ypos: int, new_Color: bool, color=None):
-    global tile_map
-    # check that we have not already added the tile
-    if (xpos, ypos) in tile_map:
-        return
-    
-    # check that are working with an open square
-    if maze[xpos][ypos] != 0:
-        raise ValueError("called add tile on nonvalid square")
-    # we have a new tile, so we must add it
-    # we get a new color if the previous node told us to
-    if new_Color:
-        color = get_unique_color()
-    elif color == None:
-        raise ValueError("did not recieve a color, or permission to create a new color")
-
-    tile_map[(xpos, ypos)] = Tile(xpos, ypos, color)
-    
-    # now we check the neighbors and call each of them
-    # if this current cell has more than 2 neighbors, then it's children will all get new colors
-    new_color_child = (neighbor_count[xpos][ypos] > 2)
-
-    # we have a valid empty space we check its top neighbor
-    if xpos > 0 and maze[xpos-1][ypos] == 0:
-        add_tile(xpos-1, ypos, new_color_child, color)
-    # now left neighbor
-    if ypos > 0 and maze[xpos][ypos-1] == 0:
-        add_tile(xpos, ypos-1, new_color_child, color)
-    # now below neighbor
-    if xpos < GRID_SIZE - 1 and maze[xpos+1][ypos] == 0:
-        add_tile(xpos+1, ypos, new_color_child, color)
-    # now right neighbor
-    if ypos < GRID_SIZE - 1 and maze[xpos][ypos+1] == 0:
-        add_tile(xpos, ypos+1, new_color_child, color)
-
-# starting preprocessing by making the first tile
-# first empty tile is 0, 1
-add_tile(0, 1, True)
-
-def add_node(xpos: int, ypos: int, new_Node: bool, parent=None):
-    global node_map
-    # check that we haven't added this location yet
-    if (xpos, ypos) in node_map:
-        return
-    # check that we are working with an open square
-    if maze[xpos][ypos] != 0:
-        raise ValueError("called add_node() on an nonvalid sqaure")
-    
-    # if we were told to make a new node at this location, we must add it, otherwise we use the parent node
-    if new_Node:
-        is_start = (xpos == start_pos[0] and ypos == start_pos[1])
-        is_end = (xpos == end_pos[0] and ypos == end_pos[1])
-        new_node = Node(xpos, ypos, tile_map[(xpos, ypos)].color, 0, 0, 0, 0, is_start=is_start, is_end=is_end)
-        # add the child to the parent node (if it exists)
-        if parent != None:
-            parent.children.append(new_node)
-        parent = new_node
-    elif parent == None:
-        raise ValueError("do not have a parent or permission to create a parent wihtin add_node")
-    # add the correct node to the dictionary
-    node_map[(xpos, ypos)] = parent
-    # print("added node with color", tile_map[(xpos, ypos)].color, "at location ", xpos, ", ", ypos)
-
-    # if the current cell has more than 2 neighbors, then it's children will get new nodes in the tree
-    new_node_child = neighbor_count[xpos][ypos] > 2
-
-    # now we explore each of the children
-    if xpos > 0 and maze[xpos-1][ypos] == 0:
-        add_node(xpos-1, ypos, new_node_child, parent)
-    # now left neighbor
-    if ypos > 0 and maze[xpos][ypos-1] == 0:
-        add_node(xpos, ypos-1, new_node_child, parent)
-    # now below neighbor
-    if xpos < GRID_SIZE - 1 and maze[xpos+1][ypos] == 0:
-        add_node(xpos+1, ypos, new_node_child, parent)
-    # now right neighbor
-    if ypos < GRID_SIZE - 1 and maze[xpos][ypos+1] == 0:
-        add_node(xpos, ypos+1, new_node_child, parent)
-
-# now start preprocessing the first location for the tree
-add_node(0, 1, True)
+# split the corridors into segments, each one gets its own color and node in the tree
+segment_labels, segment_parents, segment_entries = label_segments(maze, start_pos)
+segment_colors = [tuple(color) for color in segment_palette(len(segment_parents)).tolist()]
+tree_nodes = []  # the tree node of every segment reachable from the start, indexed by segment
+
+def build_tree():
+    # segments are numbered so that parents come before their children, and the children of
+    # a node end up in the order they are entered from it
+    end_segment = segment_labels[end_pos[0], end_pos[1]]
+    for segment, parent in enumerate(segment_parents.tolist()):
+        if segment and parent == -1:
+            break  # the rest is cut off from the start
+        xpos, ypos = segment_entries[segment]
+        node = Node(xpos, ypos, segment_colors[segment], 0, 0, 0, 0, is_start=(segment == 0),
+                    is_end=(segment == end_segment), parent=tree_nodes[parent] if parent != -1 else None)
+        if node.parent is not None:
+            node.parent.children.append(node)
+        tree_nodes.append(node)
+
+def node_at(row, col):
+    # the tree node of the segment containing a cell, None for walls and unreachable cells
+    segment = segment_labels[row, col]
+    return tree_nodes[segment] if 0 <= segment < len(tree_nodes) else None
+
+build_tree()
 
 # now determine the display positions of the nodes in the tree
-def update_pos(node, disp_x, disp_y, new_domain_left, new_domain_right):
-    # update the current node with the correct values
-    node.disp_xpos = disp_x
-    node.disp_ypos = disp_y
-    node.left_domain = new_domain_left
-    node.right_domain = new_domain_right
-
-    # update the children with the correct values (each node has 0 or 2 children)
-    left = True
-    for child in node.children:
-        if left:
-            # we are populating a left child
-            update_pos(child, (disp_x + new_domain_left)//2, disp_y + TREE_NODE_RADIUS * TREE_NODE_OFFSET, new_domain_left, disp_x)
-        else:
-            # we are populating a right child
-            update_pos(child, (disp_x + new_domain_right)//2, disp_y + TREE_NODE_RADIUS * TREE_NODE_OFFSET, disp_x, new_domain_right)
-        left = False
+TREE_SIBLING_SPACING = TREE_NODE_RADIUS * 3  # horizontal distance between neighbouring nodes
+
+def layout_tree(root):
+    # tidy layout: handles any number of children per node and never squeezes a deep
+    # subtree narrower than one node per slot, the tree camera zooms out to fit it instead
+    nodes, x, depth, left, right = tidy_layout(root, TREE_SIBLING_SPACING)
+    for node, node_x, node_depth, node_left, node_right in zip(nodes, x, depth, left, right):
+        node.disp_xpos = TREE_X_OFFSET + node_x
+        node.disp_ypos = TREE_NODE_RADIUS * TREE_CURSOR_MULTIPLIER + node_depth * TREE_NODE_RADIUS * TREE_NODE_OFFSET
+        node.left_domain = TREE_X_OFFSET + node_left
+        node.right_domain = TREE_X_OFFSET + node_right
 
 # setting all of the locations of the tree
-update_pos(node_map[(0, 1)], TREE_X_OFFSET, TREE_NODE_RADIUS * TREE_CURSOR_MULTIPLIER, WINDOW_HEIGHT + TREE_NODE_RADIUS, WINDOW_WIDTH - TREE_NODE_RADIUS)
-
-def get_tree_path():
-    current_path = []
-    get_tree_path_recursive(node_map[(0, 1)], current_path)
-    return current_path
-    
-
-
-def get_tree_path_recursive(node, current_leaf_path):
-    if node == node_map[(player_pos[0], player_pos[1])]:
-        # if this has been called on the actual current node
-        # add this node to the path
-        current_leaf_path.append(node)
-        return True
-    # if this node is not the where the cursor is, check the children (if it isnt a leaf)
-    # if the node is a leaf, we return false
-    if len(node.children) == 0:
-        return False
-    # the node has children, so we return OR of the children's true/false
-    if get_tree_path_recursive(node.children[0], current_leaf_path) or get_tree_path_recursive(node.children[1], current_leaf_path):
-        # one of the children is on the path, so we add the current to the list and return true
-        current_leaf_path.append(node)
-        return True
-    # node has children, but neither are on the path, return false
-    return False
-
-
+layout_tree(tree_nodes[0])
 
+# the path only changes when the player moves, so the last one is kept
+tree_path_pos = None
+tree_path = []
 
+def get_tree_path():
+    # nodes from the player's node up to the root, found by walking the parent pointers
+    global tree_path_pos, tree_path
+    if tree_path_pos != (player_pos[0], player_pos[1]):
+        tree_path_pos = (player_pos[0], player_pos[1])
+        tree_path = []
+        node = node_at(*tree_path_pos)
+        while node is not None:
+            tree_path.append(node)
+            node = node.parent
+    return tree_path
 
 
 # START DISPLAY
 screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("15x15 Maze Solver - BFS/DFS")
+pygame.display.set_caption(f"{GRID_SIZE}x{GRID_SIZE} Maze Solver - BFS/DFS")
 font = pygame.font.SysFont('Arial', 20)
 
 # For BFS/DFS exploration visualization
-visited_cells = set()  # Cells that have been explored
-frontier_cells = set()  # Cells that are in the queue to be explored
-path_cells = set()  # Cells that are part of the final solution
-
-def draw_maze():
+# one byte per cell each, with a NumPy view (mask) for whole-maze updates
+visited_cells = CellSet(GRID_SIZE, GRID_SIZE)  # Cells that have been explored
+frontier_cells = CellSet(GRID_SIZE, GRID_SIZE)  # Cells that are in the queue to be explored
+path_cells = CellSet(GRID_SIZE, GRID_SIZE)  # Cells that are part of the final solution
+
+# The walls and corridor colors never change during a solve, so they are rendered once into
+# maze_background. maze_surface holds the background plus the exploration state, and each
+# frame only the cells in dirty_cells are repainted onto it.
+maze_background = None
+maze_surface = None
+dirty_cells = set()  # Cells whose exploration state changed since the last frame
+weight_text_cache = {}
+
+def draw_weight(surface, row, col):
+    weight = cell_weights[row][col]
+    if weight not in weight_text_cache:
+        weight_text_cache[weight] = small_font.render(str(weight), True, BLACK)
+    weight_text = weight_text_cache[weight]
+    surface.blit(weight_text, weight_text.get_rect(center=((col + 0.5) * CELL_SIZE, (row + 0.5) * CELL_SIZE)))
+
+def build_maze_background():
+    background = pygame.Surface((GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE))
     for row in range(GRID_SIZE):
         for col in range(GRID_SIZE):
             if maze[row][col] == 1:
                 color = BLACK
-            elif (row, col) in path_cells:
-                # Part of the final solution path
-                color = GREEN
-            elif (row, col) in visited_cells:
-                # Visited during BFS/DFS exploration
-                color = GREY
-            elif (row, col) in frontier_cells:
-                # In the frontier (queue)
-                color = LIGHT_BLUE
             elif (row, col) == (start_pos[0], start_pos[1]):
                 # Start position
                 color = BLUE
@@ -333,62 +250,255 @@ def draw_maze():
                 color = GREEN
             else:
                 # Normal open cell
-                color = tile_map[(row, col)].color
-            pygame.draw.rect(screen, color, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+                color = segment_colors[segment_labels[row, col]]
+            pygame.draw.rect(background, color, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            if cell_weights is not None and maze[row][col] == 0:
+                draw_weight(background, row, col)
+    return background
+
+# Mazes with more cells than the pane has pixels go through the surfarray renderer instead
+pixel_renderer = None
+if CELL_SIZE < MIN_RECT_CELL_SIZE:
+    pixel_renderer = PixelMazeRenderer(maze, start_pos, end_pos, {
+        WALL: BLACK, OPEN: WHITE, VISITED: GREY, FRONTIER: LIGHT_BLUE, PATH: GREEN, START: BLUE, END: GREEN,
+    }, WINDOW_HEIGHT)
+
+def exploration_state(cell):
+    # same priority as exploration_color, as a pixel renderer state
+    if cell in path_cells:
+        return PATH
+    if cell in frontier_cells:
+        return FRONTIER
+    if cell in visited_cells:
+        return VISITED
+    return None
+
+def exploration_color(cell):
+    if cell in path_cells:
+        # Part of the final solution path
+        return GREEN
+    if cell in frontier_cells:
+        # In the frontier (queue)
+        return LIGHT_BLUE
+    if cell in visited_cells:
+        # Visited during BFS/DFS exploration
+        return GREY
+    return None
+
+def draw_cell(row, col):
+    cell_rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+    color = exploration_color((row, col)) if maze[row][col] == 0 else None
+    if color is None:
+        # back to the static look of the cell
+        maze_surface.blit(maze_background, cell_rect, cell_rect)
+        return
+    pygame.draw.rect(maze_surface, color, cell_rect)
+    if cell_weights is not None:
+        draw_weight(maze_surface, row, col)
+
+def invalidate_maze_background():
+    # call when the walls, colors or weights change
+    global maze_background, maze_surface
+    maze_background = None
+    maze_surface = None
+
+def reset_maze_surface():
+    # call when the exploration sets were replaced rather than changed step by step
+    global maze_surface
+    maze_surface = None
+    if pixel_renderer is not None:
+        pixel_renderer.reset(visited_cells.mask, frontier_cells.mask, path_cells.mask)
+
+# Cameras for zooming and panning the maze (world units are cells) and the tree (world units
+# are the tree's display coordinates)
+MAZE_PANE = pygame.Rect(0, 0, WINDOW_HEIGHT, WINDOW_HEIGHT)
+TREE_PANE = pygame.Rect(WINDOW_HEIGHT, 0, WINDOW_WIDTH - WINDOW_HEIGHT, WINDOW_HEIGHT)
+maze_camera = Camera(MAZE_PANE, (0, 0, GRID_SIZE, GRID_SIZE), max_zoom=max(4.0, GRID_SIZE / 8))
+
+def tree_bounds():
+    # (x, y, width, height) covering the tree pane and every node of the tree
+    left, top, right, bottom = TREE_PANE.left, TREE_PANE.top, TREE_PANE.right, TREE_PANE.bottom
+    for node in tree_nodes:
+        left, right = min(left, node.disp_xpos - TREE_NODE_RADIUS), max(right, node.disp_xpos + TREE_NODE_RADIUS)
+        top, bottom = min(top, node.disp_ypos - TREE_NODE_RADIUS), max(bottom, node.disp_ypos + TREE_NODE_RADIUS)
+    return left, top, right - left, bottom - top
+
+tree_camera = Camera(TREE_PANE, tree_bounds())
+# wide trees start zoomed out to fit the pane, so allow zooming back in past full size
+tree_camera.max_zoom = max(tree_camera.max_zoom, 2 / tree_camera.fit_scale)
+
+def visible_cells():
+    # (row0, col0, row1, col1) of the cells inside the maze pane, and the screen rect they cover
+    x, y, width, height = maze_camera.view()
+    col0, row0 = max(0, int(x)), max(0, int(y))
+    col1, row1 = min(GRID_SIZE, math.ceil(x + width)), min(GRID_SIZE, math.ceil(y + height))
+    left, top = maze_camera.to_screen(col0, row0)
+    right, bottom = maze_camera.to_screen(col1, row1)
+    return (row0, col0, row1, col1), pygame.Rect(round(left), round(top), round(right - left), round(bottom - top))
+
+def draw_maze_pixels():
+    for row, col in dirty_cells:
+        pixel_renderer.set_cell(row, col, exploration_state((row, col)))
+    dirty_cells.clear()
+    cells, dest = visible_cells()
+    pixel_renderer.draw(screen, cells, dest)
+
+def draw_maze():
+    global maze_background, maze_surface
+    if show_heatmap:
+        heatmap_image.draw(screen, *visible_cells())
+        return
+    if pixel_renderer is not None:
+        draw_maze_pixels()
+        return
+    if maze_background is None:
+        maze_background = build_maze_background()
+    if maze_surface is None:
+        maze_surface = maze_background.copy()
+        dirty_cells.update(path_cells, frontier_cells, visited_cells)
+    for row, col in dirty_cells:
+        draw_cell(row, col)
+    dirty_cells.clear()
+    # only the visible cells are scaled onto the pane
+    (row0, col0, row1, col1), dest = visible_cells()
+    source = pygame.Rect(col0 * CELL_SIZE, row0 * CELL_SIZE, (col1 - col0) * CELL_SIZE, (row1 - row0) * CELL_SIZE)
+    if source.size == dest.size:
+        screen.blit(maze_surface, dest, source)
+    else:
+        screen.blit(pygame.transform.scale(maze_surface.subsurface(source), dest.size), dest)
+
+# Distance field: one BFS from field_source gives the distance to and shortest path of every
+# cell, so with the heatmap on (H key) clicking a cell shows its path at once and shift-click
+# picks a new source. The field is kept until the source or the walls change.
+distance_field = None
+field_source = tuple(start_pos)
+field_goal = None
+show_heatmap = False
+heatmap_base = None  # heatmap colors of distance_field, before the path is drawn on
+heatmap_image = None
+
+def get_distance_field():
+    global distance_field, heatmap_base
+    if distance_field is None or distance_field.source != field_source:
+        distance_field = DistanceField(maze, field_source, args.workers)
+        heatmap_base = heatmap_rgb(distance_field.distance, np.asarray(maze) == 1)
+    return distance_field
+
+def invalidate_distance_field():
+    # call when the walls change
+    global distance_field
+    distance_field = None
+
+def update_heatmap():
+    # the heatmap with the path from the source to the chosen goal drawn in white
+    global heatmap_image
+    field = get_distance_field()
+    rgb = heatmap_base.copy()
+    if field_goal is not None:
+        path = field.path_to(field_goal)
+        if path:
+            rows, cols = zip(*path)
+            rgb[list(rows), list(cols)] = WHITE
+    rgb[field_source] = WHITE
+    heatmap_image = GridImage(rgb)
+
+def draw_heatmap_stats():
+    field = get_distance_field()
+    stats_text = f"Distances from {field_source}: farthest cell {field.max_distance} steps"
+    if field_goal is not None:
+        goal_distance = field.distance_to(field_goal)
+        stats_text += f", {field_goal}: " + (f"{goal_distance} steps" if goal_distance >= 0 else "unreachable")
+    screen.blit(small_font.render(stats_text, True, BLACK), (SEEK_BAR_X, SEEK_BAR_Y - 25))
 
 def draw_player():
-    pygame.draw.rect(
-        screen, RED, (player_pos[1] * CELL_SIZE, player_pos[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-    )
-
-def draw_subtree(subtreeroot):
-    for node in subtreeroot.children:
-        # Draw line connecting parent to child
-        pygame.draw.line(screen, BLACK, 
-                          (subtreeroot.disp_xpos, subtreeroot.disp_ypos), 
-                          (node.disp_xpos, node.disp_ypos), 2)
-        draw_subtree(node)
+    # at least a few pixels wide so the player stays visible on huge mazes
+    left, top = maze_camera.to_screen(player_pos[1], player_pos[0])
+    size = max(3, math.ceil(maze_camera.scale))
+    pygame.draw.rect(screen, RED, (int(left), int(top), size, size))
 
+def draw_tree_node(node, surface):
     # Draw the node as a circle or triangle depending on if it's a start or end node
-    if subtreeroot.is_start or subtreeroot.is_end:
+    scale = tree_camera.scale
+    x, y = tree_camera.to_screen(node.disp_xpos, node.disp_ypos)
+    if node.is_start or node.is_end:
         # Draw a triangle for start/end nodes
-        triangle_size = TREE_NODE_RADIUS * 1.5
-        if subtreeroot.is_start:
+        triangle_size = TREE_NODE_RADIUS * 1.5 * scale
+        if node.is_start:
             # Draw an upward-pointing triangle for start
             points = [
-                (subtreeroot.disp_xpos, subtreeroot.disp_ypos - triangle_size),
-                (subtreeroot.disp_xpos - triangle_size, subtreeroot.disp_ypos + triangle_size/2),
-                (subtreeroot.disp_xpos + triangle_size, subtreeroot.disp_ypos + triangle_size/2)
+                (x, y - triangle_size),
+                (x - triangle_size, y + triangle_size/2),
+                (x + triangle_size, y + triangle_size/2)
             ]
-            pygame.draw.polygon(screen, BLUE, points)
+            pygame.draw.polygon(surface, BLUE, points)
         else:
             # Draw a downward-pointing triangle for end
             points = [
-                (subtreeroot.disp_xpos, subtreeroot.disp_ypos + triangle_size),
-                (subtreeroot.disp_xpos - triangle_size, subtreeroot.disp_ypos - triangle_size/2),
-                (subtreeroot.disp_xpos + triangle_size, subtreeroot.disp_ypos - triangle_size/2)
+                (x, y + triangle_size),
+                (x - triangle_size, y - triangle_size/2),
+                (x + triangle_size, y - triangle_size/2)
             ]
-            pygame.draw.polygon(screen, GREEN, points)
+            pygame.draw.polygon(surface, GREEN, points)
     else:
         # Draw regular nodes as circles
-        pygame.draw.circle(screen, subtreeroot.color, (subtreeroot.disp_xpos, subtreeroot.disp_ypos), TREE_NODE_RADIUS)
+        pygame.draw.circle(surface, node.color, (x, y), max(2, TREE_NODE_RADIUS * scale))
+
+def draw_tree_edge(parent, child, surface):
+    pygame.draw.line(surface, BLACK, tree_camera.to_screen(parent.disp_xpos, parent.disp_ypos),
+                     tree_camera.to_screen(child.disp_xpos, child.disp_ypos), 2)
+
+def draw_subtree(subtreeroot, surface):
+    # walks the tree with an explicit stack, deep corridor trees would overflow recursion
+    view_x, view_y, view_width, view_height = tree_camera.view()
+    stack = [subtreeroot]
+    while stack:
+        parent = stack.pop()
+        for node in parent.children:
+            # Draw line connecting parent to child
+            draw_tree_edge(parent, node, surface)
+            # a subtree lies inside its node's domain and below the node, skip it if that is off screen
+            if (node.right_domain + TREE_NODE_RADIUS < view_x or node.left_domain - TREE_NODE_RADIUS > view_x + view_width
+                    or node.disp_ypos - TREE_NODE_RADIUS > view_y + view_height):
+                continue
+            stack.append(node)
+        draw_tree_node(parent, surface)
+
+# The tree only changes when the tree camera moves, so it is drawn once into tree_surface
+# (same size as the window, only the tree pane is used) and blitted every frame.
+tree_surface = None
+tree_surface_view = None
 
 def draw_tree():
-    # draw a square for the current node
-    if (player_pos[0], player_pos[1]) in node_map:
-        tree_loc_x = node_map[(player_pos[0], player_pos[1])].disp_xpos
-        tree_loc_y = node_map[(player_pos[0], player_pos[1])].disp_ypos
-        pygame.draw.rect(screen, RED, (tree_loc_x - TREE_NODE_RADIUS * TREE_CURSOR_MULTIPLIER, 
-                                      tree_loc_y - TREE_NODE_RADIUS * TREE_CURSOR_MULTIPLIER, 
-                                      TREE_NODE_RADIUS * 2 * TREE_CURSOR_MULTIPLIER, 
-                                      TREE_NODE_RADIUS * 2 * TREE_CURSOR_MULTIPLIER))
-    draw_subtree(node_map[(0, 1)])
+    global tree_surface, tree_surface_view
+    view = (tree_camera.x, tree_camera.y, tree_camera.zoom)
+    if tree_surface is None or view != tree_surface_view:
+        if tree_surface is None:
+            tree_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            tree_surface.set_clip(TREE_PANE)
+        tree_surface.fill(WHITE)
+        draw_subtree(tree_nodes[0], tree_surface)
+        tree_surface_view = view
+    screen.blit(tree_surface, TREE_PANE, TREE_PANE)
+
+    # draw a square for the current node, then its edges and the node itself back on top
+    node = node_at(player_pos[0], player_pos[1])
+    if node is not None:
+        tree_loc_x, tree_loc_y = tree_camera.to_screen(node.disp_xpos, node.disp_ypos)
+        cursor_size = TREE_NODE_RADIUS * TREE_CURSOR_MULTIPLIER * tree_camera.scale
+        pygame.draw.rect(screen, RED, (tree_loc_x - cursor_size, tree_loc_y - cursor_size,
+                                      cursor_size * 2, cursor_size * 2))
+        if node.parent is not None:
+            draw_tree_edge(node.parent, node, screen)
+        for child in node.children:
+            draw_tree_edge(node, child, screen)
+        draw_tree_node(node, screen)
 
 def draw_dfs_stack():
     dfs_stack = get_tree_path()
     step_text = small_font.render(DFS_STACK_TEXT, True, BLACK)
     for node in dfs_stack:
-        screen.blit(step_text, (node.disp_xpos + 21, node.disp_ypos -15))
+        x, y = tree_camera.to_screen(node.disp_xpos, node.disp_ypos)
+        screen.blit(step_text, (x + 21 * tree_camera.scale, y - 15))
 
 
 def draw_button(button_x, button_y, button_text, hover=False):
@@ -403,137 +513,244 @@ def is_button_hovered(pos, button_x, button_y):
     x, y = pos
     return button_x <= x <= button_x + BUTTON_WIDTH and button_y <= y <= button_y + BUTTON_HEIGHT
 
-# Function for BFS - Modified to return exploration history
-def find_path_bfs():
-    queue = deque([(start_pos[0], start_pos[1], [])]) 
-    visited = set([(start_pos[0], start_pos[1])])
-    
-    exploration_history = []  
-    
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    dir_names = ["UP", "RIGHT", "DOWN", "LEFT"]
-    
-    # Add initial state
-    exploration_history.append((set(visited), set(), (start_pos[0], start_pos[1])))
-    
-    while queue:
-        row, col, path = queue.popleft()
-        
-        # Check if we reached the exit
-        if row == end_pos[0] and col == end_pos[1]:
-            # Add the final path to the history
-            path_set = set()
-            current_pos = (start_pos[0], start_pos[1])
-            path_set.add(current_pos)
-            
-            for move in path:
-                if move == "UP":
-                    current_pos = (current_pos[0] - 1, current_pos[1])
-                elif move == "RIGHT":
-                    current_pos = (current_pos[0], current_pos[1] + 1)
-                elif move == "DOWN":
-                    current_pos = (current_pos[0] + 1, current_pos[1])
-                elif move == "LEFT":
-                    current_pos = (current_pos[0], current_pos[1] - 1)
-                path_set.add(current_pos)
-            
-            return path, exploration_history, path_set
-        
-        # Add neighbors to the frontier
-        frontier = set()
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if (0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE and 
-                maze[new_row][new_col] == 0 and (new_row, new_col) not in visited):
-                frontier.add((new_row, new_col))
-        
-        # Record current state
-        if frontier:
-            exploration_history.append((set(visited), frontier, (row, col)))
-        
-        # Try all four directions
-        for i, (dr, dc) in enumerate(directions):
-            new_row, new_col = row + dr, col + dc
-            
-            # Check if the new position is valid and not visited
-            if (0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE and 
-                maze[new_row][new_col] == 0 and (new_row, new_col) not in visited):
-                queue.append((new_row, new_col, path + [dir_names[i]]))
-                visited.add((new_row, new_col))
-    
-    return [], exploration_history, set()  # No path found
-
-# Function for DFS - Modified to return exploration history
-def find_path_dfs():
-    stack = [(start_pos[0], start_pos[1], [])]
-    visited = set([(start_pos[0], start_pos[1])])
-    
-    exploration_history = []
-    
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    dir_names = ["UP", "RIGHT", "DOWN", "LEFT"]
-    
-    # Add initial state
-    exploration_history.append((set(visited), set(), (start_pos[0], start_pos[1])))
-    
-    while stack:
-        row, col, path = stack.pop()  # DFS uses a stack (pop from end)
-        
-        # Check if we reached the exit
-        if row == end_pos[0] and col == end_pos[1]:
-            # Add the final path to the history
-            path_set = set()
-            current_pos = (start_pos[0], start_pos[1])
-            path_set.add(current_pos)
-            
-            for move in path:
-                if move == "UP":
-                    current_pos = (current_pos[0] - 1, current_pos[1])
-                elif move == "RIGHT":
-                    current_pos = (current_pos[0], current_pos[1] + 1)
-                elif move == "DOWN":
-                    current_pos = (current_pos[0] + 1, current_pos[1])
-                elif move == "LEFT":
-                    current_pos = (current_pos[0], current_pos[1] - 1)
-                path_set.add(current_pos)
-            
-            return path, exploration_history, path_set
-        
-        # Add neighbors to the frontier
-        frontier = set()
-        valid_moves = []
-        
-        # Check all four directions
-        for i, (dr, dc) in enumerate(directions):
-            new_row, new_col = row + dr, col + dc
-            
-            # Check if the new position is valid and not visited
-            if (0 <= new_row < GRID_SIZE and 0 <= new_col < GRID_SIZE and 
-                maze[new_row][new_col] == 0 and (new_row, new_col) not in visited):
-                frontier.add((new_row, new_col))
-                valid_moves.append((new_row, new_col, path + [dir_names[i]]))
-        
-        # Record current state
-        if frontier:
-            exploration_history.append((set(visited), frontier, (row, col)))
-        
-        # Add valid moves to the stack (in reverse order to prioritize UP, RIGHT, DOWN, LEFT)
-        for move in reversed(valid_moves):
-            new_row, new_col, new_path = move
-            stack.append((new_row, new_col, new_path))
-            visited.add((new_row, new_col))
-    
-    return [], exploration_history, set()  # No path found
+def stop_solver():
+    # abandon the solver thread of the previous solve, if it is still running
+    global solver_thread
+    if solver_thread is not None:
+        solver_thread.cancel()
+        solver_thread = None
+
+def receive_solver_steps():
+    # record the steps the solver thread has sent since the last frame; once it has finished,
+    # its path is converted into player moves
+    global solution_path, final_path_set
+    if solver_thread is None or solver_thread.finished:
+        return
+    solver_thread.receive(exploration_history, time.perf_counter() + RECEIVE_TIME_BUDGET)
+    if solver_thread.finished:
+        solution_path = path_to_moves(solver_thread.path)
+        final_path_set = set(solver_thread.path)
+
+def start_solve(algorithm):
+    # Reset and start exploring the maze with the given solver, which runs in the background
+    # so playback starts while it is still searching
+    global player_pos, solution_path, exploration_history, final_path_set, solving_active
+    global current_step, exploration_step, in_exploration_phase, current_algorithm
+    global move_direction, solution_paused, step_budget, solve_wait, solver_thread
+    if use_junction_graph and f"Graph {algorithm}" in SOLVERS:
+        algorithm = f"Graph {algorithm}"
+    player_pos = original_player_pos.copy()
+    stop_solver()
+    solution_path, final_path_set = [], set()
+    exploration_history = ExplorationHistory(GRID_SIZE, GRID_SIZE)
+    solver_thread = SolverThread(algorithm, maze, start_pos, end_pos, cell_weights)
+    solver_thread.start()
+    solving_active = True
+    current_step = 0
+    exploration_step = 0
+    visited_cells.clear()
+    frontier_cells.clear()
+    path_cells.clear()
+    reset_maze_surface()
+    in_exploration_phase = True
+    current_algorithm = algorithm
+    move_direction = None
+    solution_paused = False
+    step_budget = 0.0
+    solve_wait = 0.0
+
+    # print(f"{algorithm} Solution path:", solution_path)
+    # print(f"{algorithm} exploration: {len(exploration_history)} steps")
+
+def make_cell_weights(seed=0):
+    # random cost (1-9) of stepping into each open cell
+    rng = random.Random(seed)
+    return [[rng.randint(1, 9) if maze[row][col] == 0 else 0 for col in range(GRID_SIZE)] for row in range(GRID_SIZE)]
+
+def draw_solve_stats():
+    # show how much work the last solver did, so the algorithms can be compared
+    if current_algorithm is None and replan_text is not None:
+        screen.blit(small_font.render(replan_text, True, BLACK), (SEEK_BAR_X, SEEK_BAR_Y - 25))
+    if current_algorithm is None or len(exploration_history) == 0:
+        return
+    nodes_expanded = len(exploration_history) - 1
+    if solver_thread.finished:
+        stats_text = f"{current_algorithm}: {nodes_expanded} nodes expanded, path length {len(solution_path)}"
+    else:
+        stats_text = f"{current_algorithm}: {nodes_expanded} nodes expanded so far, solving..."
+    if cell_weights is not None and current_algorithm.endswith(("A*", "Dijkstra")):
+        stats_text += " (weighted)"
+    screen.blit(small_font.render(stats_text, True, BLACK), (SEEK_BAR_X, SEEK_BAR_Y - 25))
+
+def apply_exploration_step(step):
+    # play one recorded step forward by applying its deltas to the displayed sets
+    global player_pos
+    new_visited, frontier_added, frontier_removed = exploration_history.step_delta(step)
+    visited_cells.update(new_visited)
+    frontier_cells.difference_update(frontier_removed)
+    frontier_cells.update(frontier_added)
+    dirty_cells.update(new_visited, frontier_added, frontier_removed)
+    player_pos = list(exploration_history.current(step))
+
+def seek_exploration(step):
+    # jump straight to any recorded step, rebuilt from the nearest checkpoint
+    global player_pos
+    visited_mask, frontier_mask, current_pos = exploration_history.seek(step)
+    visited_cells.set_mask(visited_mask)
+    frontier_cells.set_mask(frontier_mask)
+    reset_maze_surface()
+    player_pos = list(current_pos)
+
+def draw_seek_bar():
+    pygame.draw.rect(screen, GREY, (SEEK_BAR_X, SEEK_BAR_Y, SEEK_BAR_WIDTH, SEEK_BAR_HEIGHT), border_radius=3)
+    if len(exploration_history) > 0:
+        progress = min(exploration_step, len(exploration_history)) / len(exploration_history)
+        pygame.draw.rect(screen, BUTTON_COLOR, (SEEK_BAR_X, SEEK_BAR_Y, int(SEEK_BAR_WIDTH * progress), SEEK_BAR_HEIGHT), border_radius=3)
+
+def is_seek_bar_hovered(pos):
+    x, y = pos
+    return SEEK_BAR_X <= x <= SEEK_BAR_X + SEEK_BAR_WIDTH and SEEK_BAR_Y <= y <= SEEK_BAR_Y + SEEK_BAR_HEIGHT
+
+def move_player(direction):
+    # move one cell in the given direction unless there is a wall
+    global player_pos
+    dr, dc = {"UP": (-1, 0), "DOWN": (1, 0), "LEFT": (0, -1), "RIGHT": (0, 1)}[direction]
+    new_pos = [player_pos[0] + dr, player_pos[1] + dc]
+    if 0 <= new_pos[0] < GRID_SIZE and 0 <= new_pos[1] < GRID_SIZE and maze[new_pos[0]][new_pos[1]] == 0:
+        player_pos = new_pos
+
+def solve_step():
+    # one step of the current solve: an exploration step, then one move along the path;
+    # returns False if playback has caught up with the solver thread and has to wait for it
+    global exploration_step, in_exploration_phase, player_pos, current_step, solving_active, solve_wait
+    if in_exploration_phase:
+        if exploration_step < len(exploration_history):
+            apply_exploration_step(exploration_step)
+            exploration_step += 1
+        elif not solver_thread.finished:
+            return False
+        # Check if exploration is complete
+        if exploration_step >= len(exploration_history) and solver_thread.finished:
+            in_exploration_phase = False
+            # Reset player position to start for the solution path
+            player_pos = original_player_pos.copy()
+            # Mark the final path cells
+            path_cells.update(final_path_set)
+            dirty_cells.update(final_path_set)
+            # Pause before starting the solution path, as long as 2.5 steps but at most PATH_PAUSE
+            solve_wait = min(PATH_PAUSE, 2.5 / SOLVE_SPEEDS[solve_speed])
+    elif current_step < len(solution_path):
+        # Now follow the solution path
+        move_player(solution_path[current_step])
+        current_step += 1
+    if not in_exploration_phase and current_step >= len(solution_path):
+        solving_active = False
+    return True
+
+def run_solve(frame_time):
+    # advance the solve by the steps due in this frame, but never for longer than STEP_TIME_BUDGET
+    global solve_wait, step_budget
+    if solve_wait > 0:
+        solve_wait -= frame_time
+        return
+    step_budget += frame_time * SOLVE_SPEEDS[solve_speed]
+    deadline = time.perf_counter() + STEP_TIME_BUDGET
+    while step_budget >= 1 and solving_active:
+        if not solve_step():
+            step_budget = 0
+            break
+        step_budget -= 1
+        if solve_wait > 0 or time.perf_counter() > deadline:
+            step_budget = 0
+            break
+
+def draw_solve_speed():
+    speed_text = f"Speed: {SOLVE_SPEEDS[solve_speed]} steps/s (+/-)"
+    if use_junction_graph:
+        speed_text = "Junction graph (G)   " + speed_text
+    speed_text = small_font.render(speed_text, True, BLACK)
+    screen.blit(speed_text, speed_text.get_rect(topright=(SEEK_BAR_X + SEEK_BAR_WIDTH, SEEK_BAR_Y - 50)))
+
+def clear_solve():
+    # stop the current solve and take its exploration off the maze
+    global solving_active, current_step, exploration_step, move_direction, solution_paused
+    global current_algorithm, step_budget, solve_wait
+    stop_solver()
+    solving_active = False
+    current_step = 0
+    exploration_step = 0
+    visited_cells.clear()
+    frontier_cells.clear()
+    path_cells.clear()
+    reset_maze_surface()
+    move_direction = None
+    solution_paused = False
+    current_algorithm = None
+    step_budget = 0.0
+    solve_wait = 0.0
+
+def rebuild_tree():
+    # the walls changed: segment the corridors again, then rebuild and lay out the tree
+    global segment_labels, segment_parents, segment_entries, segment_colors, tree_path_pos, tree_surface_view
+    segment_labels, segment_parents, segment_entries = label_segments(maze, start_pos)
+    segment_colors = [tuple(color) for color in segment_palette(len(segment_parents)).tolist()]
+    tree_nodes.clear()
+    build_tree()
+    layout_tree(tree_nodes[0])
+    tree_camera.set_world(tree_bounds())
+    tree_camera.max_zoom = max(8.0, 2 / tree_camera.fit_scale)
+    tree_path_pos = None
+    tree_surface_view = None
+
+def toggle_wall(row, col):
+    # flip a cell between wall and corridor, then let the planner repair the path from start
+    # to end and compare its work with a full A* search of the edited maze
+    global planner, replan_text
+    if [row, col] in (start_pos, end_pos, player_pos):
+        return
+    clear_solve()
+    if planner is None:
+        planner = LifelongPlanner(maze, start_pos, end_pos, cell_weights)
+        planner.replan()
+    maze[row][col] ^= 1
+    if cell_weights is not None and maze[row][col] == 0:
+        cell_weights[row][col] = random.randint(1, 9)
+        if cell_weights[row][col] < planner.min_cost:
+            # cheaper than any cell the planner's heuristic was built for
+            planner = LifelongPlanner(maze, start_pos, end_pos, cell_weights)
+    if pixel_renderer is not None:
+        pixel_renderer.set_wall(row, col, maze[row][col] == 1)
+    invalidate_maze_background()
+    invalidate_distance_field()
+    rebuild_tree()
+
+    planner.update_cell((row, col))
+    expanded = planner.replan()
+    path = planner.path()
+    full_expanded = sum(1 for _ in solve_astar(maze, tuple(start_pos), tuple(end_pos), cell_weights)) - 1
+    path_cells.update(path)
+    dirty_cells.update(path)
+    replan_text = (f"Path repaired: {expanded} cells re-expanded vs {full_expanded} for a full A* solve"
+                   if path else f"No path left ({expanded} cells re-expanded)")
 
 # Global variables for auto-solving
 solution_path = []
 solving_active = False
 current_step = 0
 exploration_history = []
+solver_thread = None  # SolverThread streaming the steps of the current solve
 exploration_step = 0
 final_path_set = set()
 in_exploration_phase = False
-current_algorithm = None  # To track whether we're using BFS or DFS
+current_algorithm = None  # To track which solver is being animated
+cell_weights = None  # Optional cost of entering each cell, toggled with the W key
+planner = None  # LifelongPlanner kept between wall edits, made on the first edit
+replan_text = None  # what the last wall edit cost the planner
+use_junction_graph = False  # BFS, Dijkstra and A* search the junction graph instead of the grid, toggled with G
+solve_speed = DEFAULT_SOLVE_SPEED
+step_budget = 0.0  # steps owed to the solve, carried over between frames
+solve_wait = 0.0  # seconds left before the solve continues
+move_timer = 0.0  # seconds until a held arrow key moves the player again
 
 # Main loop
 running = True
@@ -545,15 +762,23 @@ button_hover_reset = False
 button_hover_pause = False
 solution_paused = False
 button_hover_step = False
-solution_step = False
+button_hover_astar = False
+button_hover_dijkstra = False
+button_hover_bibfs = False
+button_hover_jps = False
 
 while running:
+    frame_time = min(clock.tick(FPS) / 1000, MAX_FRAME_TIME)
     mouse_pos = pygame.mouse.get_pos()
     button_hover_bfs = is_button_hovered(mouse_pos, BUTTON_X_BFS, BUTTON_Y_BFS)
     button_hover_dfs = is_button_hovered(mouse_pos, BUTTON_X_DFS, BUTTON_Y_DFS)
     button_hover_reset = is_button_hovered(mouse_pos, BUTTON_X_RESET, BUTTON_Y_RESET)
     button_hover_pause = is_button_hovered(mouse_pos, BUTTON_X_PAUSE, BUTTON_Y_PAUSE)
     button_hover_step = is_button_hovered(mouse_pos, BUTTON_X_STEP, BUTTON_Y_STEP)
+    button_hover_astar = is_button_hovered(mouse_pos, BUTTON_X_ASTAR, BUTTON_Y_ASTAR)
+    button_hover_dijkstra = is_button_hovered(mouse_pos, BUTTON_X_DIJKSTRA, BUTTON_Y_DIJKSTRA)
+    button_hover_bibfs = is_button_hovered(mouse_pos, BUTTON_X_BIBFS, BUTTON_Y_BIBFS)
+    button_hover_jps = is_button_hovered(mouse_pos, BUTTON_X_JPS, BUTTON_Y_JPS)
     
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -561,61 +786,63 @@ while running:
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:
                 move_direction = "UP"
+                move_timer = 0
             elif event.key == pygame.K_DOWN:
                 move_direction = "DOWN"
+                move_timer = 0
             elif event.key == pygame.K_LEFT:
                 move_direction = "LEFT"
+                move_timer = 0
             elif event.key == pygame.K_RIGHT:
                 move_direction = "RIGHT"
+                move_timer = 0
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                solve_speed = min(solve_speed + 1, len(SOLVE_SPEEDS) - 1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                solve_speed = max(solve_speed - 1, 0)
+            elif event.key == pygame.K_HOME:
+                # back to the whole maze and tree
+                maze_camera.reset()
+                tree_camera.reset()
+            elif event.key == pygame.K_h:
+                # toggle the distance heatmap
+                show_heatmap = not show_heatmap
+                if show_heatmap:
+                    update_heatmap()
+            elif event.key == pygame.K_w:
+                # toggle random cell weights (used by Dijkstra and A*)
+                cell_weights = None if cell_weights is not None else make_cell_weights()
+                invalidate_maze_background()
+                planner = None
+            elif event.key == pygame.K_g:
+                # toggle solving on the junction graph, where each corridor is one edge
+                use_junction_graph = not use_junction_graph
         elif event.type == pygame.KEYUP:
             move_direction = None
+        elif maze_camera.handle_event(event, mouse_pos) or tree_camera.handle_event(event, mouse_pos):
+            # zooming or panning one of the panes
+            pass
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if button_hover_bfs:
                 # Reset and start BFS exploration
-                player_pos = original_player_pos.copy()
-                solution_path, exploration_history, final_path_set = find_path_bfs()
-                solving_active = True
-                current_step = 0
-                exploration_step = 0
-                visited_cells.clear()
-                frontier_cells.clear()
-                path_cells.clear()
-                in_exploration_phase = True
-                current_algorithm = "BFS"
-                move_direction = None
-                solution_paused = False
-
-                # print("BFS Solution path:", solution_path)
-                # print(f"BFS exploration: {len(exploration_history)} steps")
+                start_solve("BFS")
             elif button_hover_dfs:
                 # Reset and start DFS exploration
-                player_pos = original_player_pos.copy()
-                solution_path, exploration_history, final_path_set = find_path_dfs()
-                solving_active = True
-                current_step = 0
-                exploration_step = 0
-                visited_cells.clear()
-                frontier_cells.clear()
-                path_cells.clear()
-                in_exploration_phase = True
-                current_algorithm = "DFS"
-                move_direction = None
-                solution_paused = False
-
-                # print("DFS Solution path:", solution_path)
-                # print(f"DFS exploration: {len(exploration_history)} steps")
+                start_solve("DFS")
+            elif button_hover_astar:
+                start_solve("A*")
+            elif button_hover_dijkstra:
+                start_solve("Dijkstra")
+            elif button_hover_bibfs:
+                start_solve("BiBFS")
+            elif button_hover_jps:
+                start_solve("JPS")
             elif button_hover_reset:
                 # print("MAZE RESET PRESSED")
                 # Reset 
+                clear_solve()
                 player_pos = original_player_pos.copy()
-                solving_active = False
-                current_step = 0
-                exploration_step = 0
-                visited_cells.clear()
-                frontier_cells.clear()
-                path_cells.clear()
-                move_direction = None
-                solution_paused = False
+                replan_text = None
             elif button_hover_pause:
                 #pause the exploration
                 # print("SOLUTION PAUSE PRESSED")
@@ -624,9 +851,34 @@ while running:
             elif button_hover_step:
                 # print("SOLUTION STEP PRESSED")
                 move_direction = None
-                if solution_paused:
-                    solution_step = True
-                    solution_paused = False
+                if solution_paused and solving_active:
+                    solve_wait = 0
+                    solve_step()
+            elif is_seek_bar_hovered(mouse_pos) and solving_active and len(exploration_history) > 0:
+                # jump to the clicked step of the exploration
+                move_direction = None
+                fraction = (mouse_pos[0] - SEEK_BAR_X) / SEEK_BAR_WIDTH
+                target_step = min(int(fraction * len(exploration_history)), len(exploration_history) - 1)
+                seek_exploration(target_step)
+                exploration_step = target_step + 1
+                in_exploration_phase = True
+                current_step = 0
+                path_cells.clear()
+                solve_wait = 0.0
+            elif show_heatmap and MAZE_PANE.collidepoint(mouse_pos):
+                # shortest path to the clicked cell from the distance field, or a new source with shift
+                col, row = (int(value) for value in maze_camera.to_world(*mouse_pos))
+                if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE and maze[row][col] == 0:
+                    if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                        field_source, field_goal = (row, col), None
+                    else:
+                        field_goal = (row, col)
+                    update_heatmap()
+            elif MAZE_PANE.collidepoint(mouse_pos):
+                # edit the maze: toggle the clicked cell (the outer wall stays closed)
+                col, row = (int(value) for value in maze_camera.to_world(*mouse_pos))
+                if 0 < row < GRID_SIZE - 1 and 0 < col < GRID_SIZE - 1:
+                    toggle_wall(row, col)
                 
 
 
@@ -634,64 +886,29 @@ while running:
 
     
     # Handle exploration visualization
+    receive_solver_steps()
     if solving_active:
         move_direction = None
-        if not solution_paused and in_exploration_phase and exploration_step < len(exploration_history):
-            # Update visualization states
-            visited_set, frontier_set, current_pos = exploration_history[exploration_step]
-            visited_cells = visited_set
-            frontier_cells = frontier_set
-            player_pos = [current_pos[0], current_pos[1]]
-            exploration_step += 1
-            pygame.time.delay(200)  # Slow down the visualization
-            
-            # Check if exploration is complete
-            if exploration_step >= len(exploration_history):
-                in_exploration_phase = False
-                # Reset player position to start for the solution path
-                player_pos = original_player_pos.copy()
-                # Mark the final path cells
-                path_cells = final_path_set
-                pygame.time.delay(500)  # Pause before starting the solution path
-        
-        elif not solution_paused and not in_exploration_phase and current_step < len(solution_path):
-            # Now follow the solution path
-            move_direction = solution_path[current_step]
-            current_step += 1
-            pygame.time.delay(200)  # Slow down the automatic moves
-            
-            if current_step >= len(solution_path):
-                solving_active = False
-        if solution_step:
-            # return the solve to paused
-            solution_step = False
-            solution_paused = True
+        if not solution_paused:
+            run_solve(frame_time)
     # Handle player movement
-    if move_direction == "UP":
-        new_pos = [player_pos[0] - 1, player_pos[1]]
-        if 0 <= new_pos[0] < GRID_SIZE and maze[new_pos[0]][new_pos[1]] == 0:
-            player_pos = new_pos
-    elif move_direction == "DOWN":
-        new_pos = [player_pos[0] + 1, player_pos[1]]
-        if 0 <= new_pos[0] < GRID_SIZE and maze[new_pos[0]][new_pos[1]] == 0:
-            player_pos = new_pos
-    elif move_direction == "LEFT":
-        new_pos = [player_pos[0], player_pos[1] - 1]
-        if 0 <= new_pos[1] < GRID_SIZE and maze[new_pos[0]][new_pos[1]] == 0:
-            player_pos = new_pos
-    elif move_direction == "RIGHT":
-        new_pos = [player_pos[0], player_pos[1] + 1]
-        if 0 <= new_pos[1] < GRID_SIZE and maze[new_pos[0]][new_pos[1]] == 0:
-            player_pos = new_pos
+    elif move_direction is not None:
+        move_timer -= frame_time
+        if move_timer <= 0:
+            move_player(move_direction)
+            move_timer = PLAYER_MOVE_INTERVAL
     
     # Drawing everything 
     # Drawing everything
     screen.fill(WHITE)
+    screen.set_clip(MAZE_PANE)
     draw_maze()
     draw_player()
+    screen.set_clip(TREE_PANE)
     draw_tree()
     if solving_active and current_algorithm == "DFS":
         draw_dfs_stack()
+    screen.set_clip(None)
 
     # draw_button(WINDOW_WIDTH-200, WINDOW_HEIGHT-100, "SOLVE BFS", button_hover_bfs )
     draw_button(BUTTON_X_BFS, BUTTON_Y_BFS, BUTTON_TEXT_BFS, button_hover_bfs)
@@ -699,15 +916,22 @@ while running:
     draw_button(BUTTON_X_RESET, BUTTON_Y_RESET, BUTTON_TEXT_RESET, button_hover_reset)
     draw_button(BUTTON_X_PAUSE, BUTTON_Y_PAUSE, BUTTON_TEXT_PAUSE, button_hover_pause)
     draw_button(BUTTON_X_STEP, BUTTON_Y_STEP, BUTTON_TEXT_STEP, button_hover_step)
+    draw_button(BUTTON_X_ASTAR, BUTTON_Y_ASTAR, BUTTON_TEXT_ASTAR, button_hover_astar)
+    draw_button(BUTTON_X_DIJKSTRA, BUTTON_Y_DIJKSTRA, BUTTON_TEXT_DIJKSTRA, button_hover_dijkstra)
+    draw_button(BUTTON_X_BIBFS, BUTTON_Y_BIBFS, BUTTON_TEXT_BIBFS, button_hover_bibfs)
+    draw_button(BUTTON_X_JPS, BUTTON_Y_JPS, BUTTON_TEXT_JPS, button_hover_jps)
+    draw_seek_bar()
+    if show_heatmap:
+        draw_heatmap_stats()
+    else:
+        draw_solve_stats()
+    draw_solve_speed()
 
     # draw_button(button_hover_dfs)
 
     # Update the display
     pygame.display.flip()
 
-    # Limit frame rate
-    clock.tick(10)
-
 # end
 pygame.quit()
 sys.exit()
\ No newline at end of file
@@ -0,0 +1,109 @@
+from array import array
+
+import numpy as np
+
+# Compact cell state. Sets of (row, col) tuples cost over 100 bytes per cell and a hash for
+# every lookup, so both the solvers and the display keep their per-cell state in flat byte
+# and int arrays instead.
+
+
+class CellSet:
+    """A set of (row, col) cells of a rows x cols grid, stored as one byte per cell.
+
+    Supports the set operations maze.py uses on its exploration state. ``mask`` is a
+    writable (rows, cols) bool view of the same bytes, for whole-grid updates.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.flags = bytearray(rows * cols)
+        self.mask = np.frombuffer(self.flags, dtype=bool).reshape(rows, cols)
+
+    def __contains__(self, cell):
+        return self.flags[cell[0] * self.cols + cell[1]] == 1
+
+    def __iter__(self):
+        for flat_id in np.flatnonzero(self.mask).tolist():
+            yield divmod(flat_id, self.cols)
+
+    def __len__(self):
+        return np.count_nonzero(self.mask)
+
+    def add(self, cell):
+        self.flags[cell[0] * self.cols + cell[1]] = 1
+
+    def discard(self, cell):
+        self.flags[cell[0] * self.cols + cell[1]] = 0
+
+    def update(self, *groups):
+        for cells in groups:
+            for row, col in cells:
+                self.flags[row * self.cols + col] = 1
+
+    def difference_update(self, *groups):
+        for cells in groups:
+            for row, col in cells:
+                self.flags[row * self.cols + col] = 0
+
+    def clear(self):
+        self.mask[:] = False
+
+    def set_mask(self, mask):
+        # replace the whole set with the True cells of a (rows, cols) bool grid
+        self.mask[:] = mask
+
+
+class PaddedGrid:
+    """The open cells of a grid as a bytearray, with a border of walls around it.
+
+    Cell (row, col) has the padded id (row + 1) * width + col, where width = cols + 1: one
+    wall row above and below, and one wall column that also serves as the left border of
+    the next row. Every open cell's up/right/down/left neighbours are then at the fixed
+    offsets in ``offsets``, without bounds checks, and the walls of the border stop any
+    search at the edge. Solvers keep their per-cell state in arrays of this size.
+    """
+
+    def __init__(self, grid, weights=None):
+        self.rows, self.cols = len(grid), len(grid[0])
+        self.width = self.cols + 1
+        self.size = (self.rows + 2) * self.width
+        padded = np.zeros((self.rows + 2, self.width), dtype=np.uint8)
+        padded[1:-1, :-1] = np.asarray(grid) == 0
+        self.open = bytearray(padded.tobytes())
+        # same order as maze_solvers.DIRECTIONS
+        self.offsets = (-self.width, 1, self.width, -1)
+        self.costs = None
+        if weights is not None:
+            costs = np.zeros((self.rows + 2, self.width), dtype=np.int64)
+            costs[1:-1, :-1] = weights
+            self.costs = array("q", costs.tobytes())
+
+    def flat(self, cell):
+        return (cell[0] + 1) * self.width + cell[1]
+
+    def cell(self, padded_id):
+        row, col = divmod(padded_id, self.width)
+        return row - 1, col
+
+    def filled(self, value, typecode="i"):
+        # a per-cell array of the given array typecode, every entry set to value
+        return array(typecode, [value]) * self.size
+
+    def path(self, parent, end):
+        # cells from the root of the parent array (its own parent) to end
+        path = [end]
+        while parent[path[-1]] != path[-1]:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return [self.cell(padded_id) for padded_id in path]
+
+
+def unpad(padded_ids, cols):
+    # padded ids (see PaddedGrid) to flat ids row * cols + col, as an int32 array
+    row, col = np.divmod(np.asarray(padded_ids, dtype=np.int64), cols + 1)
+    return ((row - 1) * cols + col).astype(np.int32)
+
+
+def padded_id(cell, cols):
+    return (cell[0] + 1) * (cols + 1) + cell[1]
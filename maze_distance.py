@@ -0,0 +1,163 @@
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Frontiers with fewer cells than this are expanded cell by cell, since a maze corridor
+# moves forward a few cells per level and NumPy calls would cost more than the work.
+VECTOR_FRONTIER = 64
+# With worker processes, frontiers of at least this many cells are split between them.
+PARALLEL_FRONTIER = 20_000
+
+# the worker's views of the shared free/level arrays, set up by _attach
+_shared = {}
+
+
+def _expand(free, level, frontier, offsets, distance):
+    # one BFS level: the free (open, not yet reached) neighbours of every frontier cell get
+    # the level number and become the next frontier
+    neighbors = (frontier[:, None] + offsets).ravel()
+    neighbors = neighbors[free[neighbors]]
+    # a cell next to two frontier cells shows up twice: stamp every entry into the level
+    # array and keep the entries whose stamp survived, which is cheaper than sorting
+    stamps = -2 - np.arange(len(neighbors), dtype=np.int32)
+    level[neighbors] = stamps
+    neighbors = neighbors[level[neighbors] == stamps]
+    free[neighbors] = False
+    level[neighbors] = distance
+    return neighbors
+
+
+def _attach(free_name, level_name, size):
+    blocks = (shared_memory.SharedMemory(name=free_name), shared_memory.SharedMemory(name=level_name))
+    _shared["blocks"] = blocks
+    _shared["free"] = np.frombuffer(blocks[0].buf, dtype=bool, count=size)
+    _shared["level"] = np.frombuffer(blocks[1].buf, dtype=np.int32, count=size)
+
+
+def _expand_band(frontier, offsets, distance):
+    # _expand for one row band in a worker. Bands share their border rows, so two workers
+    # can both claim a cell there: stamping would race, so duplicates are sorted out
+    # instead. Both workers write the same level, and the merged frontier drops the copy.
+    free, level = _shared["free"], _shared["level"]
+    neighbors = (frontier[:, None] + offsets).ravel()
+    neighbors = np.unique(neighbors[free[neighbors]])
+    free[neighbors] = False
+    level[neighbors] = distance
+    return neighbors
+
+
+def bfs_levels(open_cells, source, workers=1):
+    """Breadth-first distance in moves from source to every cell of a (rows, cols) bool grid.
+
+    The search goes one level at a time. The cells of the next level are the open, not yet
+    reached neighbours of the current one (open & ~visited), found with flat offsets on a
+    wall-padded copy of the grid. Small frontiers are expanded in a Python loop and large
+    ones with NumPy. With workers > 1, frontiers of PARALLEL_FRONTIER cells or more are
+    split into row bands and expanded by worker processes, which write straight into the
+    shared memory. Returns an int32 grid, -1 for walls and unreachable cells.
+    """
+    rows, cols = open_cells.shape
+    width = cols + 1  # same padding as maze_cells.PaddedGrid
+    size = (rows + 2) * width
+    offsets = np.array([-width, 1, width, -1])
+    # worker processes are forked, so that they don't re-run the script that started them
+    parallel = workers > 1 and "fork" in multiprocessing.get_all_start_methods()
+
+    blocks = []
+    if parallel:
+        blocks = [shared_memory.SharedMemory(create=True, size=size),
+                  shared_memory.SharedMemory(create=True, size=4 * size)]
+        free_buffer, level_buffer = blocks[0].buf, blocks[1].buf
+    else:
+        free_buffer, level_buffer = bytearray(size), bytearray(4 * size)
+    free = np.frombuffer(free_buffer, dtype=bool, count=size)
+    level = np.frombuffer(level_buffer, dtype=np.int32, count=size)
+    free_cells = memoryview(free_buffer)
+    level_cells = memoryview(level_buffer).cast("i")
+    pool = None
+    try:
+        free.reshape(rows + 2, width)[1:-1, :-1] = open_cells
+        level[:] = -1
+        start = (source[0] + 1) * width + source[1]
+        free[start] = False
+        level[start] = 0
+        if parallel:
+            pool = multiprocessing.get_context("fork").Pool(
+                workers, _attach, (blocks[0].name, blocks[1].name, size))
+
+        frontier = [start]
+        distance = 0
+        while len(frontier):
+            distance += 1
+            if len(frontier) < VECTOR_FRONTIER:
+                following = []
+                for cell in (frontier.tolist() if isinstance(frontier, np.ndarray) else frontier):
+                    for offset in (-width, 1, width, -1):
+                        neighbor = cell + offset
+                        if free_cells[neighbor]:
+                            free_cells[neighbor] = 0
+                            level_cells[neighbor] = distance
+                            following.append(neighbor)
+            elif pool is not None and len(frontier) >= PARALLEL_FRONTIER:
+                # the frontier is sorted, so equal chunks of it are bands of rows
+                bands = np.array_split(np.sort(frontier), workers)
+                following = np.unique(np.concatenate(pool.starmap(
+                    _expand_band, [(band, offsets, distance) for band in bands])))
+            else:
+                following = _expand(free, level, np.asarray(frontier), offsets, distance)
+            frontier = following
+        return level.reshape(rows + 2, width)[1:-1, :-1].copy()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        # the views have to go before the shared memory can be closed
+        del free, level
+        free_cells.release()
+        level_cells.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+class DistanceField:
+    """Breadth-first distance of every cell of a maze from one source cell.
+
+    The field is built once per source and maze with bfs_levels. After that, the shortest
+    path to any goal is read off the distances in O(path length) without searching again:
+    from the goal, keep stepping to a neighbour one move closer to the source. distance is
+    an int32 grid, -1 for walls and unreachable cells.
+    """
+
+    def __init__(self, grid, source, workers=1):
+        self.source = tuple(source)
+        self.distance = bfs_levels(np.asarray(grid) == 0, self.source, workers)
+        self.rows, self.cols = self.distance.shape
+        self.max_distance = int(self.distance.max())
+        # wall-padded flat copy for walking paths without bounds checks
+        padded = np.full((self.rows + 2, self.cols + 1), -1, dtype=np.int32)
+        padded[1:-1, :-1] = self.distance
+        self._padded = array("i", padded.tobytes())
+
+    def distance_to(self, cell):
+        return int(self.distance[cell[0], cell[1]])
+
+    def path_to(self, cell):
+        # shortest path from the source to cell as a list of (row, col), empty if unreachable
+        distance = self.distance_to(cell)
+        if distance < 0:
+            return []
+        width = self.cols + 1
+        padded = self._padded
+        current = (cell[0] + 1) * width + cell[1]
+        path = [current]
+        # up, right, down, left: the first neighbour one level down is the next step
+        for level in range(distance - 1, -1, -1):
+            for offset in (-width, 1, width, -1):
+                if padded[current + offset] == level:
+                    current += offset
+                    break
+            path.append(current)
+        path.reverse()
+        return [(padded_id // width - 1, padded_id % width) for padded_id in path]
@@ -0,0 +1,35 @@
+import random
+
+# Mazes use the same layout as the built-in one in maze.py: 1s are walls, 0s are paths,
+# odd rows/columns are rooms, the entrance is at (0, 1) and the exit at (size-1, size-2).
+
+
+def maze_size(size):
+    # generated mazes need an odd number of rows and columns
+    return max(5, size | 1)
+
+
+def generate_maze(size, seed=None):
+    # randomized depth-first search (recursive backtracker), written with an explicit stack
+    # so that it works on mazes far deeper than Python's recursion limit
+    rng = random.Random(seed)
+    size = maze_size(size)
+    maze = [[1] * size for _ in range(size)]
+
+    maze[1][1] = 0
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc) for dr, dc in ((-2, 0), (0, 2), (2, 0), (0, -2))
+                   if 0 < row + dr < size - 1 and 0 < col + dc < size - 1 and maze[row + dr][col + dc] == 1]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(options)
+        maze[(row + next_row) // 2][(col + next_col) // 2] = 0
+        maze[next_row][next_col] = 0
+        stack.append((next_row, next_col))
+
+    maze[0][1] = 0
+    maze[size - 1][size - 2] = 0
+    return maze
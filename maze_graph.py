@@ -0,0 +1,123 @@
+import numpy as np
+
+from maze_segments import adjacent_pairs, count_open_neighbors, union_find
+
+
+class JunctionGraph:
+    """The open cells of a maze with every corridor collapsed into a single weighted edge.
+
+    Nodes are the cells where a search can choose or must stop: junctions, dead ends,
+    isolated cells, and the start and end cells. Each run of corridor cells (cells with exactly
+    two open neighbours) between two nodes becomes one edge. Mazes with loops work too.
+    Parallel corridors between the same two nodes stay separate edges. A corridor that leads
+    from a node back to itself is dropped, because no shortest path uses it.
+
+    Node i is the cell with flat id nodes[i] (row * cols + col). Its outgoing edges are
+    edge_ptr[i]:edge_ptr[i + 1] in the edge arrays:
+    - edge_to: the node at the other end.
+    - edge_cost: the cost of the corridor cells, not counting either node.
+    - edge_length: the number of corridor cells.
+    - edge_entry: the first corridor cell after leaving node i, or -1 if the two nodes are
+      next to each other.
+    """
+
+    def __init__(self, grid, start, end, weights=None):
+        open_cells = np.asarray(grid) == 0
+        self.rows, self.cols = open_cells.shape
+        size = self.rows * self.cols
+        ids = np.arange(size, dtype=np.int32).reshape(self.rows, self.cols)
+        is_node = count_open_neighbors(open_cells) != 2
+        is_node[tuple(start)] = is_node[tuple(end)] = True
+        is_node = (is_node & open_cells).ravel()
+        self.is_open = open_cells.ravel()
+        self.is_node = is_node
+        self.nodes = np.flatnonzero(is_node).astype(np.int32)
+        self.node_of = np.full(size, -1, dtype=np.int32)
+        self.node_of[self.nodes] = np.arange(len(self.nodes), dtype=np.int32)
+        cell_cost = (np.ones(size, dtype=np.int64) if weights is None
+                     else np.asarray(weights, dtype=np.int64).ravel())
+        self.node_cost = cell_cost[self.nodes]
+
+        # every run of corridor cells becomes one component
+        cells, neighbors = adjacent_pairs(open_cells, ids)
+        inside = ~is_node[cells] & ~is_node[neighbors]
+        root = union_find(size, cells[inside], neighbors[inside])
+        corridor_cells = np.flatnonzero(self.is_open & ~is_node)
+        corridor_length = np.bincount(root[corridor_cells], minlength=size)
+        corridor_cost = np.bincount(root[corridor_cells], weights=cell_cost[corridor_cells], minlength=size)
+
+        # a node next to a node is an edge with no corridor cells, and adjacent_pairs already
+        # lists it once in each direction
+        leaving = is_node[cells]
+        from_node, to_cell = self.node_of[cells[leaving]], neighbors[leaving]
+        direct = is_node[to_cell]
+        direct_from, direct_to = from_node[direct], self.node_of[to_cell[direct]]
+
+        # a corridor ends next to a node at each end (the same node for a loop), so it is
+        # entered from exactly two (node, cell) pairs. A ring of corridor cells with no
+        # node on it is never entered.
+        entered = ~direct
+        corridor = root[to_cell[entered]]
+        order = np.argsort(corridor, kind="stable")
+        corridor = corridor[order][::2]
+        near, entry = from_node[entered][order], to_cell[entered][order]
+        near_a, near_b, entry_a, entry_b = near[::2], near[1::2], entry[::2], entry[1::2]
+        kept = near_a != near_b
+        corridor, near_a, near_b, entry_a, entry_b = (
+            corridor[kept], near_a[kept], near_b[kept], entry_a[kept], entry_b[kept])
+
+        edge_from = np.concatenate((direct_from, near_a, near_b))
+        edge_to = np.concatenate((direct_to, near_b, near_a))
+        edge_entry = np.concatenate((np.full(len(direct_from), -1, dtype=np.int32), entry_a, entry_b))
+        edge_length = np.concatenate((np.zeros(len(direct_from), dtype=np.int64),
+                                      np.tile(corridor_length[corridor], 2)))
+        edge_cost = np.concatenate((np.zeros(len(direct_from), dtype=np.int64),
+                                    np.tile(corridor_cost[corridor].astype(np.int64), 2)))
+        order = np.argsort(edge_from, kind="stable")
+        self.edge_to = edge_to[order]
+        self.edge_entry = edge_entry[order]
+        self.edge_length = edge_length[order]
+        self.edge_cost = edge_cost[order]
+        self.edge_ptr = np.searchsorted(edge_from[order], np.arange(len(self.nodes) + 1))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def edge_count(self):
+        # undirected edges; every one is stored once from each end
+        return len(self.edge_to) // 2
+
+    def cell(self, node):
+        return divmod(int(self.nodes[node]), self.cols)
+
+    def node_at(self, cell):
+        # the node at a (row, col) cell, -1 if the cell is not a node
+        return int(self.node_of[cell[0] * self.cols + cell[1]])
+
+    def corridor(self, node, edge):
+        # the cells walked along an edge of node as (row, col), ending with the node at its
+        # other end
+        cols = self.cols
+        previous, cell = int(self.nodes[node]), int(self.edge_entry[edge])
+        cells = []
+        while cell != -1 and not self.is_node[cell]:
+            cells.append(divmod(cell, cols))
+            col = cell % cols
+            # a corridor cell has exactly two open neighbours: carry on to the one not come from
+            for neighbor, allowed in ((cell - cols, cell >= cols), (cell + 1, col < cols - 1),
+                                      (cell + cols, cell < len(self.is_open) - cols), (cell - 1, col > 0)):
+                if allowed and neighbor != previous and self.is_open[neighbor]:
+                    previous, cell = cell, neighbor
+                    break
+        cells.append(self.cell(int(self.edge_to[edge])))
+        return cells
+
+    def expand(self, start_node, edges):
+        # the full cell path of a walk that leaves start_node along the given edges
+        path = [self.cell(start_node)]
+        node = start_node
+        for edge in edges:
+            path.extend(self.corridor(node, edge))
+            node = int(self.edge_to[edge])
+        return path
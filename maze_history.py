@@ -0,0 +1,183 @@
+import numpy as np
+
+# A full bitmap snapshot of the visited/frontier state is taken every this many steps,
+# so seeking never has to replay more than one interval of deltas.
+CHECKPOINT_INTERVAL = 256
+# Memory budget for checkpoint bitmaps when a solve expands every cell; huge mazes get a
+# wider checkpoint interval instead of gigabytes of snapshots.
+MAX_CHECKPOINT_BYTES = 64 * 1024 * 1024
+
+
+class _Int32Log:
+    # growable int32 array (amortised O(1) append, contiguous storage for slicing)
+    def __init__(self, capacity=64):
+        self.data = np.empty(capacity, dtype=np.int32)
+        self.size = 0
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > len(self.data):
+            new_data = np.empty(max(needed, 2 * len(self.data)), dtype=np.int32)
+            new_data[:self.size] = self.data[:self.size]
+            self.data = new_data
+
+    def append(self, value):
+        self._reserve(1)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.int32)
+        self._reserve(len(values))
+        self.data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+
+class ExplorationHistory:
+    """Append-only log of solver steps stored as per-step deltas of flat cell ids.
+
+    Step ``i`` is the state after applying the deltas of steps ``0..i``: the cells newly
+    marked visited, the cells pushed onto the frontier and the cells taken off it.
+    Packed bitmap checkpoints let ``seek`` rebuild any step in O(checkpoint interval).
+    """
+
+    def __init__(self, rows, cols, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.rows = rows
+        self.cols = cols
+        self.num_cells = rows * cols
+        # each checkpoint costs two packed bitmaps, so widen the interval on huge grids
+        bitmap_bytes = 2 * ((self.num_cells + 7) // 8)
+        self.checkpoint_interval = max(checkpoint_interval,
+                                       self.num_cells * bitmap_bytes // MAX_CHECKPOINT_BYTES)
+
+        self._current = _Int32Log()
+        # CSR style: the deltas of step i are ids[ptr[i]:ptr[i + 1]]
+        self._visited, self._visited_ptr = _Int32Log(), _Int32Log()
+        self._frontier_add, self._frontier_add_ptr = _Int32Log(), _Int32Log()
+        self._frontier_remove, self._frontier_remove_ptr = _Int32Log(), _Int32Log()
+        for ptr in (self._visited_ptr, self._frontier_add_ptr, self._frontier_remove_ptr):
+            ptr.append(0)
+
+        # live state while recording, used to take checkpoints without replaying
+        self._visited_state = np.zeros(self.num_cells, dtype=bool)
+        self._frontier_state = np.zeros(self.num_cells, dtype=bool)
+        self._checkpoints = []  # (packed visited, packed frontier) after step k * interval
+
+    def __len__(self):
+        return self._current.size
+
+    def flat(self, cell):
+        return cell[0] * self.cols + cell[1]
+
+    def cell(self, flat_id):
+        return divmod(int(flat_id), self.cols)
+
+    def _flat_ids(self, cells):
+        return np.fromiter((row * self.cols + col for row, col in cells), dtype=np.int32)
+
+    def record(self, current, visited=(), frontier_add=(), frontier_remove=()):
+        # record one solver step; cells are (row, col) pairs
+        visited = self._flat_ids(visited)
+        frontier_add = self._flat_ids(frontier_add)
+        frontier_remove = self._flat_ids(frontier_remove)
+
+        self._current.append(self.flat(current))
+        self._visited.extend(visited)
+        self._visited_ptr.append(self._visited.size)
+        self._frontier_add.extend(frontier_add)
+        self._frontier_add_ptr.append(self._frontier_add.size)
+        self._frontier_remove.extend(frontier_remove)
+        self._frontier_remove_ptr.append(self._frontier_remove.size)
+
+        self._visited_state[visited] = True
+        self._frontier_state[frontier_remove] = False
+        self._frontier_state[frontier_add] = True
+        if (len(self) - 1) % self.checkpoint_interval == 0:
+            self._checkpoints.append((np.packbits(self._visited_state),
+                                      np.packbits(self._frontier_state)))
+
+    def record_batch(self, current, visited, visited_counts, frontier_add, add_counts,
+                     frontier_remove, remove_counts):
+        # record many steps at once from flat-id arrays; each counts array gives the number of
+        # ids that belong to each step, in step order
+        first = len(self)
+        self._current.extend(current)
+        for log, ptr, ids, counts in ((self._visited, self._visited_ptr, visited, visited_counts),
+                                      (self._frontier_add, self._frontier_add_ptr, frontier_add, add_counts),
+                                      (self._frontier_remove, self._frontier_remove_ptr, frontier_remove, remove_counts)):
+            ptr.extend(log.size + np.cumsum(counts))
+            log.extend(ids)
+
+        # bring the live state forward one checkpoint interval at a time
+        step, last = first, len(self) - 1
+        while step <= last:
+            checkpoint = -(-step // self.checkpoint_interval) * self.checkpoint_interval
+            end = min(last, checkpoint)
+            self._apply(self._visited_state, self._frontier_state, step, end)
+            if end == checkpoint:
+                self._checkpoints.append((np.packbits(self._visited_state),
+                                          np.packbits(self._frontier_state)))
+            step = end + 1
+
+    def current(self, step):
+        return self.cell(self._current.data[step])
+
+    def step_delta(self, step):
+        # (visited, frontier added, frontier removed) lists of (row, col) for one step
+        def cells(log, ptr):
+            ids = log.data[ptr.data[step]:ptr.data[step + 1]]
+            return [divmod(int(flat_id), self.cols) for flat_id in ids]
+        return (cells(self._visited, self._visited_ptr),
+                cells(self._frontier_add, self._frontier_add_ptr),
+                cells(self._frontier_remove, self._frontier_remove_ptr))
+
+    def _apply(self, visited, frontier, first, last):
+        # apply the deltas of steps first..last (inclusive) to flat visited/frontier masks
+        if first > last:
+            return
+        # the visited set only grows, so the whole window can be applied at once
+        ptr = self._visited_ptr.data
+        visited[self._visited.data[ptr[first]:ptr[last + 1]]] = True
+
+        # frontier cells can come and go; within a step removals happen before additions,
+        # and the last event per cell in the window decides its final state
+        add_ptr, remove_ptr = self._frontier_add_ptr.data, self._frontier_remove_ptr.data
+        added = self._frontier_add.data[add_ptr[first]:add_ptr[last + 1]]
+        removed = self._frontier_remove.data[remove_ptr[first]:remove_ptr[last + 1]]
+        if len(added) or len(removed):
+            steps = np.arange(first, last + 1)
+            added_steps = np.repeat(steps, np.diff(add_ptr[first:last + 2]))
+            removed_steps = np.repeat(steps, np.diff(remove_ptr[first:last + 2]))
+            ids = np.concatenate((removed, added))
+            order_key = 2 * np.concatenate((removed_steps, added_steps))
+            order_key[len(removed):] += 1
+            is_add = np.concatenate((np.zeros(len(removed), bool), np.ones(len(added), bool)))
+            order = np.argsort(order_key, kind="stable")
+            ids, is_add = ids[order][::-1], is_add[order][::-1]
+            last_ids, first_index = np.unique(ids, return_index=True)
+            frontier[last_ids] = is_add[first_index]
+
+    def seek(self, step):
+        # returns (visited mask, frontier mask, current cell) after the given step
+        if not 0 <= step < len(self):
+            raise IndexError("exploration step out of range")
+        checkpoint = step // self.checkpoint_interval
+        base = checkpoint * self.checkpoint_interval
+        packed_visited, packed_frontier = self._checkpoints[checkpoint]
+        visited = np.unpackbits(packed_visited, count=self.num_cells).astype(bool)
+        frontier = np.unpackbits(packed_frontier, count=self.num_cells).astype(bool)
+        self._apply(visited, frontier, base + 1, step)
+        return (visited.reshape(self.rows, self.cols),
+                frontier.reshape(self.rows, self.cols),
+                self.current(step))
+
+    @property
+    def nbytes(self):
+        logs = (self._current, self._visited, self._visited_ptr, self._frontier_add,
+                self._frontier_add_ptr, self._frontier_remove, self._frontier_remove_ptr)
+        return (sum(log.nbytes for log in logs)
+                + sum(v.nbytes + f.nbytes for v, f in self._checkpoints))
@@ -0,0 +1,255 @@
+import math
+
+import numpy as np
+import pygame
+
+# Cell states for the pixel renderer. When a maze is shrunk so that several cells share one
+# screen pixel, the highest exploration state in the block wins, so the order is also the
+# display priority.
+WALL, OPEN, VISITED, FRONTIER, PATH, START, END = range(7)
+
+
+class PixelMazeRenderer:
+    """Draws a maze with one pixel per cell, for mazes with more cells than the window has pixels.
+
+    The maze is kept as a uint8 grid of cell states. Each screen pixel covers a block of
+    cells: the static walls and corridors are averaged once, and exploration states are kept
+    as a per-block maximum that is updated cell by cell. Drawing maps the reduced grid to RGB
+    through a color lookup table and pushes it with pygame.surfarray.blit_array, so a frame
+    costs the changed cells plus the pane size, however big the maze is.
+    """
+
+    def __init__(self, maze, start, end, palette, pane_size):
+        self.base = np.where(np.asarray(maze, dtype=np.uint8) == 1, WALL, OPEN).astype(np.uint8)
+        self.base[start[0], start[1]] = START
+        self.base[end[0], end[1]] = END
+        self.state = self.base.copy()
+        self.rows, self.cols = self.state.shape
+        # palette maps every state to an (r, g, b) color
+        self.lut = np.array([palette[state] for state in range(len(palette))], dtype=np.uint8)
+
+        # each screen pixel shows a block x block square of cells
+        self.block = max(1, -(-max(self.rows, self.cols) // pane_size))
+        self.reduced_rows = -(-self.rows // self.block)
+        self.reduced_cols = -(-self.cols // self.block)
+        self.surface = pygame.Surface((self.reduced_cols, self.reduced_rows))
+        scale = pane_size / max(self.reduced_rows, self.reduced_cols)
+        self.scaled_size = (round(self.reduced_cols * scale), round(self.reduced_rows * scale))
+        self._drawn = None
+
+        # walls and corridors never change, so their averaged color is computed once
+        static = np.where(self.base >= VISITED, OPEN, self.base)
+        self.base_rgb = self._blocks(self.lut[static].astype(np.float32)).mean(axis=(1, 3)).astype(np.uint8)
+        self.reset()
+
+    def _blocks(self, grid):
+        # view a (rows, cols, ...) grid as (reduced rows, block, reduced cols, block, ...),
+        # padding the edges up to a whole number of blocks
+        padded_shape = (self.reduced_rows * self.block, self.reduced_cols * self.block) + grid.shape[2:]
+        if grid.shape != padded_shape:
+            padded = np.zeros(padded_shape, dtype=grid.dtype)
+            padded[:self.rows, :self.cols] = grid
+            grid = padded
+        return grid.reshape((self.reduced_rows, self.block, self.reduced_cols, self.block) + grid.shape[2:])
+
+    def set_wall(self, row, col, wall):
+        # a cell was toggled between wall and corridor; updates its static look and its block
+        self.base[row, col] = WALL if wall else OPEN
+        self.state[row, col] = self.base[row, col]
+        block_row, block_col = row // self.block, col // self.block
+        rows = slice(block_row * self.block, (block_row + 1) * self.block)
+        cols = slice(block_col * self.block, (block_col + 1) * self.block)
+        static = np.where(self.base[rows, cols] >= VISITED, OPEN, self.base[rows, cols])
+        # edge blocks are padded with walls when averaged, as in __init__
+        padded = np.zeros((self.block, self.block), dtype=np.uint8)
+        padded[:static.shape[0], :static.shape[1]] = static
+        self.base_rgb[block_row, block_col] = self.lut[padded].astype(np.float32).mean(axis=(0, 1)).astype(np.uint8)
+        self.set_cell(row, col, None)
+
+    def reset(self, visited=None, frontier=None, path=None):
+        # back to the static maze, then mark the True cells of the given (rows, cols) bool
+        # grids; where they overlap the later one wins, as it does for set_cell callers
+        self.state[:] = self.base
+        for mask, state in ((visited, VISITED), (frontier, FRONTIER), (path, PATH)):
+            if mask is not None:
+                self.state[mask] = state
+        highest = self._blocks(self.state).max(axis=(1, 3))
+        self.reduced = np.where(highest >= VISITED, highest, 0).astype(np.uint8)
+        self.stale = True
+
+    def set_cell(self, row, col, state):
+        # state=None puts the cell back to its static look (wall, corridor, start or end)
+        self.state[row, col] = self.base[row, col] if state is None else state
+        block_row, block_col = row // self.block, col // self.block
+        highest = self.state[block_row * self.block:(block_row + 1) * self.block,
+                             block_col * self.block:(block_col + 1) * self.block].max()
+        self.reduced[block_row, block_col] = highest if highest >= VISITED else 0
+        self.stale = True
+
+    def _reduce(self, row0, col0, row1, col1, block):
+        # RGB image of a window of the maze with one pixel per block x block cells
+        if block == self.block and (row0, col0, row1, col1) == (0, 0, self.rows, self.cols):
+            return np.where(self.reduced[..., None] > 0, self.lut[self.reduced], self.base_rgb)
+        window = self.state[row0:row1, col0:col1]
+        rows, cols = -(-window.shape[0] // block), -(-window.shape[1] // block)
+        padded = np.zeros((rows * block, cols * block), dtype=np.uint8)
+        padded[:window.shape[0], :window.shape[1]] = window
+        blocks = padded.reshape(rows, block, cols, block)
+        highest = blocks.max(axis=(1, 3))
+        if block == 1:
+            return self.lut[highest]
+        static = self.lut[np.where(blocks >= VISITED, OPEN, blocks)].astype(np.float32).mean(axis=(1, 3))
+        return np.where(highest[..., None] >= VISITED, self.lut[highest], static.astype(np.uint8))
+
+    def draw(self, screen, cells=None, dest=None):
+        # cells is the visible (row0, col0, row1, col1) window, dest the screen rect it maps to;
+        # only the cells inside the window are reduced and drawn
+        cells = cells or (0, 0, self.rows, self.cols)
+        dest = pygame.Rect(dest or ((0, 0), self.scaled_size))
+        if self.stale or (cells, tuple(dest)) != self._drawn:
+            row0, col0, row1, col1 = cells
+            # rounded up like self.block, so the unzoomed view uses the precomputed reduction
+            block = max(1, math.ceil(max((row1 - row0) / max(dest.height, 1), (col1 - col0) / max(dest.width, 1))))
+            rgb = self._reduce(row0, col0, row1, col1, block)
+            if self.surface.get_size() != rgb.shape[1::-1]:
+                self.surface = pygame.Surface(rgb.shape[1::-1])
+            # surfarray indexes surfaces as (x, y), so the (row, col) grid is transposed
+            pygame.surfarray.blit_array(self.surface, rgb.transpose(1, 0, 2))
+            self.scaled = pygame.transform.scale(self.surface, dest.size)
+            self.stale = False
+            self._drawn = (cells, tuple(dest))
+        screen.blit(self.scaled, dest)
+
+
+# heatmap colors from near to far
+HEAT_COLORS = [(0, 0, 255), (0, 255, 255), (0, 255, 0), (255, 255, 0), (255, 0, 0)]
+
+
+def heatmap_rgb(distance, walls, max_distance=None):
+    # (rows, cols, 3) uint8 image of a distance grid, blue near the source through to red at
+    # max_distance; walls are black and open cells that cannot be reached dark grey
+    if max_distance is None:
+        max_distance = int(distance.max())
+    stops = np.linspace(0, 1, len(HEAT_COLORS))
+    fraction = np.clip(distance, 0, None) / max(max_distance, 1)
+    rgb = np.stack([np.interp(fraction, stops, [color[channel] for color in HEAT_COLORS])
+                    for channel in range(3)], axis=-1).astype(np.uint8)
+    rgb[distance < 0] = (64, 64, 64)
+    rgb[walls] = (0, 0, 0)
+    return rgb
+
+
+class GridImage:
+    """An RGB image with one pixel per maze cell, drawn through a camera window.
+
+    Only the visible window is converted, subsampled to about one pixel per screen pixel, and
+    the scaled result is reused until the window or the image changes (set ``stale``).
+    """
+
+    def __init__(self, rgb):
+        self.rgb = rgb
+        self.stale = True
+        self._drawn = None
+
+    def draw(self, screen, cells, dest):
+        dest = pygame.Rect(dest)
+        if self.stale or (cells, tuple(dest)) != self._drawn:
+            row0, col0, row1, col1 = cells
+            block = max(1, math.ceil(max((row1 - row0) / max(dest.height, 1), (col1 - col0) / max(dest.width, 1))))
+            window = self.rgb[row0:row1:block, col0:col1:block]
+            # surfarray indexes surfaces as (x, y), so the (row, col) grid is transposed
+            self.scaled = pygame.transform.scale(pygame.surfarray.make_surface(window.transpose(1, 0, 2)), dest.size)
+            self.stale = False
+            self._drawn = (cells, tuple(dest))
+        screen.blit(self.scaled, dest)
+
+
+class Camera:
+    """Zoom and pan for one pane, mapping world coordinates onto the pane's screen rectangle.
+
+    At zoom 1 the whole world fits the pane. The mouse wheel zooms around the cursor and
+    dragging with the right (or middle) mouse button pans.
+    """
+
+    ZOOM_STEP = 1.25
+    PAN_BUTTONS = (2, 3)
+
+    def __init__(self, pane, world, max_zoom=8.0):
+        self.pane = pygame.Rect(pane)
+        self.world = tuple(world)  # (x, y, width, height)
+        self.fit_scale = min(self.pane.width / self.world[2], self.pane.height / self.world[3])
+        self.max_zoom = max(1.0, max_zoom)
+        self.dragging = False
+        self.reset()
+
+    def set_world(self, world):
+        # the world changed size; keeps the zoom but refits and clamps the view
+        self.world = tuple(world)
+        self.fit_scale = min(self.pane.width / self.world[2], self.pane.height / self.world[3])
+        self._clamp()
+
+    def reset(self):
+        self.zoom = 1.0
+        self.x, self.y = self.world[0], self.world[1]
+        self._clamp()
+
+    @property
+    def scale(self):
+        # screen pixels per world unit
+        return self.fit_scale * self.zoom
+
+    def view(self):
+        # visible part of the world as (x, y, width, height)
+        return self.x, self.y, self.pane.width / self.scale, self.pane.height / self.scale
+
+    def to_screen(self, x, y):
+        return self.pane.x + (x - self.x) * self.scale, self.pane.y + (y - self.y) * self.scale
+
+    def to_world(self, screen_x, screen_y):
+        return self.x + (screen_x - self.pane.x) / self.scale, self.y + (screen_y - self.pane.y) / self.scale
+
+    def zoom_at(self, pos, factor):
+        # keep the world point under the cursor in place
+        world_x, world_y = self.to_world(*pos)
+        self.zoom = min(max(self.zoom * factor, 1.0), self.max_zoom)
+        self.x = world_x - (pos[0] - self.pane.x) / self.scale
+        self.y = world_y - (pos[1] - self.pane.y) / self.scale
+        self._clamp()
+
+    def pan(self, dx, dy):
+        self.x -= dx / self.scale
+        self.y -= dy / self.scale
+        self._clamp()
+
+    def _clamp(self):
+        # keep the view inside the world, centering it along any axis where it is larger
+        world_x, world_y, world_width, world_height = self.world
+        _, _, view_width, view_height = self.view()
+        if view_width >= world_width:
+            self.x = world_x - (view_width - world_width) / 2
+        else:
+            self.x = min(max(self.x, world_x), world_x + world_width - view_width)
+        if view_height >= world_height:
+            self.y = world_y - (view_height - world_height) / 2
+        else:
+            self.y = min(max(self.y, world_y), world_y + world_height - view_height)
+
+    def handle_event(self, event, mouse_pos):
+        # returns True if the event was a zoom or pan for this pane
+        inside = self.pane.collidepoint(mouse_pos)
+        if event.type == pygame.MOUSEWHEEL and inside:
+            self.zoom_at(mouse_pos, self.ZOOM_STEP ** event.y)
+            return True
+        if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) and event.button in (4, 5) and inside:
+            # older wheel events, already handled through MOUSEWHEEL
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button in self.PAN_BUTTONS and inside:
+            self.dragging = True
+            return True
+        if event.type == pygame.MOUSEBUTTONUP and event.button in self.PAN_BUTTONS and self.dragging:
+            self.dragging = False
+            return True
+        if event.type == pygame.MOUSEMOTION and self.dragging:
+            self.pan(*event.rel)
+            return True
+        return False
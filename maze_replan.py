@@ -0,0 +1,95 @@
+import heapq
+
+from maze_solvers import DIRECTIONS, is_open, open_neighbors, cell_cost, manhattan
+
+INFINITY = float("inf")
+
+
+class LifelongPlanner:
+    """Lifelong Planning A* (Koenig, Likhachev and Furcy) between two fixed cells of a grid.
+
+    The first replan() is an ordinary A* search. After that, whenever cells of the grid are
+    toggled between wall and corridor, call update_cell() for each of them and replan()
+    again: only cells whose distance from the start changed, and that can still matter for
+    the path to the goal, are expanded again. replan() returns how many cells it expanded.
+    """
+
+    def __init__(self, grid, start, goal, weights=None):
+        self.grid = grid
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.weights = weights
+        # Manhattan distance scaled by the cheapest move stays admissible on weighted cells
+        self.min_cost = 1 if weights is None else min(
+            weights[row][col] for row in range(len(grid)) for col in range(len(grid[0])) if grid[row][col] == 0)
+        self.g = {}
+        self.rhs = {self.start: 0}
+        # lazy priority queue: queued holds the current key of every inconsistent cell, heap
+        # entries with any other key are stale and skipped
+        self.heap = []
+        self.queued = {}
+        self._queue(self.start)
+
+    def _key(self, cell):
+        best = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        return best + self.min_cost * manhattan(cell, self.goal), best
+
+    def _queue(self, cell):
+        key = self._key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.heap, (key, cell))
+
+    def _top_key(self):
+        while self.heap and self.queued.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else (INFINITY, INFINITY)
+
+    def _update_vertex(self, cell):
+        # recompute the one-step lookahead rhs and (re)queue the cell if it is inconsistent
+        if cell != self.start:
+            if is_open(self.grid, *cell):
+                best = min((self.g.get(neighbor, INFINITY) for neighbor in open_neighbors(self.grid, *cell)),
+                           default=INFINITY)
+                self.rhs[cell] = best + cell_cost(self.weights, cell)
+            else:
+                self.rhs[cell] = INFINITY
+        if self.g.get(cell, INFINITY) != self.rhs.get(cell, INFINITY):
+            self._queue(cell)
+        else:
+            self.queued.pop(cell, None)
+
+    def update_cell(self, cell):
+        # call after the cell was toggled between wall and corridor
+        cell = tuple(cell)
+        self._update_vertex(cell)
+        for dr, dc in DIRECTIONS:
+            if is_open(self.grid, cell[0] + dr, cell[1] + dc):
+                self._update_vertex((cell[0] + dr, cell[1] + dc))
+
+    def replan(self):
+        expanded = 0
+        while (self._top_key() < self._key(self.goal)
+               or self.rhs.get(self.goal, INFINITY) != self.g.get(self.goal, INFINITY)):
+            _, cell = heapq.heappop(self.heap)
+            del self.queued[cell]
+            expanded += 1
+            if self.g.get(cell, INFINITY) > self.rhs.get(cell, INFINITY):
+                # overconsistent: its distance got shorter, settle it
+                self.g[cell] = self.rhs[cell]
+            else:
+                # underconsistent: its old distance is gone, re-evaluate it and its neighbours
+                self.g[cell] = INFINITY
+                self._update_vertex(cell)
+            for neighbor in open_neighbors(self.grid, *cell):
+                self._update_vertex(neighbor)
+        return expanded
+
+    def path(self):
+        # shortest path from start to goal as a list of cells, empty if there is none
+        if self.g.get(self.goal, INFINITY) == INFINITY:
+            return []
+        path = [self.goal]
+        while path[-1] != self.start:
+            path.append(min(open_neighbors(self.grid, *path[-1]), key=lambda cell: self.g.get(cell, INFINITY)))
+        path.reverse()
+        return path
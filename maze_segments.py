@@ -0,0 +1,148 @@
+from collections import deque
+
+import numpy as np
+
+# Corridor segmentation for the maze tree. A segment is a run of open cells between
+# junctions (cells with more than two open neighbours). Each junction joins the segment it
+# is entered from when walking out from the start, and the segments entered from a
+# junction become that segment's children in the corridor tree.
+
+# neighbour order used when walking out from a cell: up, left, down, right
+_STEPS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+
+
+def count_open_neighbors(open_cells):
+    # number of open up/down/left/right neighbours of every open cell (0 for walls)
+    counts = np.zeros(open_cells.shape, dtype=np.int8)
+    counts[1:] += open_cells[:-1]
+    counts[:-1] += open_cells[1:]
+    counts[:, 1:] += open_cells[:, :-1]
+    counts[:, :-1] += open_cells[:, 1:]
+    return np.where(open_cells, counts, 0)
+
+
+def adjacent_pairs(open_cells, ids):
+    # (cell, neighbour) flat ids of every open pair, one block per direction in _STEPS order
+    rows, cols = open_cells.shape
+    cells, neighbors = [], []
+    for dr, dc in _STEPS:
+        source = (slice(max(0, -dr), rows - max(0, dr)), slice(max(0, -dc), cols - max(0, dc)))
+        target = (slice(max(0, dr), rows - max(0, -dr)), slice(max(0, dc), cols - max(0, -dc)))
+        both = open_cells[source] & open_cells[target]
+        cells.append(ids[source][both])
+        neighbors.append(ids[target][both])
+    return np.concatenate(cells), np.concatenate(neighbors)
+
+
+def union_find(count, a, b):
+    # vectorized union-find: every round hooks each root onto the smallest root it is joined
+    # to, then pointer jumping flattens the trees. Pairs already in one tree are dropped, so
+    # later rounds only touch the pairs still to be joined.
+    parent = np.arange(count, dtype=np.int32)
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        differ = root_a != root_b
+        if not differ.any():
+            return parent
+        a, b, root_a, root_b = a[differ], b[differ], root_a[differ], root_b[differ]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        # only cells whose parent is not a root yet need jumping, and there are fewer each time
+        pending = np.flatnonzero(parent != parent[parent])
+        while len(pending):
+            parent[pending] = parent[parent[pending]]
+            pending = pending[parent[pending] != parent[parent[pending]]]
+
+
+def label_segments(maze, start):
+    """Splits the open cells of a maze into corridor segments.
+
+    Returns (labels, parents, entries): labels is an int32 grid with the segment of every
+    open cell (-1 for walls), parents[s] is the segment that s is entered from (-1 for the
+    start segment and anything unreachable) and entries[s] the (row, col) cell where it is
+    entered. Segments reachable from the start are numbered in breadth-first order, so the
+    start segment is 0 and every parent comes before its children.
+    """
+    open_cells = np.asarray(maze) == 0
+    rows, cols = open_cells.shape
+    ids = np.arange(rows * cols, dtype=np.int32).reshape(rows, cols)
+    junction = (count_open_neighbors(open_cells) > 2).ravel()
+
+    # runs of non-junction cells are joined into components, every junction stays alone
+    cells, neighbors = adjacent_pairs(open_cells, ids)
+    inside = ~junction[cells] & ~junction[neighbors]
+    root = union_find(rows * cols, cells[inside], neighbors[inside])
+    open_ids = ids[open_cells]
+    component_ids, component = np.unique(root[open_ids], return_inverse=True)
+    component_of = np.full(rows * cols, -1, dtype=np.int32)
+    component_of[open_ids] = component
+    component_count = len(component_ids)
+    single_junction = junction[component_ids]  # components are ids of their smallest cell
+
+    # graph between components, with each component's edges in the neighbour order above
+    between = component_of[cells] != component_of[neighbors]
+    edge_from, edge_to = component_of[cells[between]], component_of[neighbors[between]]
+    edge_cell = neighbors[between]
+    order = np.argsort(edge_from, kind="stable")
+    edge_to, edge_cell = edge_to[order].tolist(), edge_cell[order].tolist()
+    edge_ptr = np.searchsorted(edge_from[order], np.arange(component_count + 1)).tolist()
+
+    # walk out from the start one component at a time
+    start_component = int(component_of[start[0] * cols + start[1]])
+    came_from = [-1] * component_count
+    entry = [-1] * component_count
+    came_from[start_component] = start_component
+    entry[start_component] = start[0] * cols + start[1]
+    walk = [start_component]
+    queue = deque(walk)
+    while queue:
+        current = queue.popleft()
+        for edge in range(edge_ptr[current], edge_ptr[current + 1]):
+            following = edge_to[edge]
+            if came_from[following] == -1:
+                came_from[following] = current
+                entry[following] = edge_cell[edge]
+                walk.append(following)
+                queue.append(following)
+    came_from[start_component] = -1
+
+    # a junction entered from a corridor belongs to that corridor's segment; the corridor
+    # itself is never merged, so one lookup is enough
+    walk = np.array(walk, dtype=np.int32)
+    came_from = np.array(came_from, dtype=np.int32)[walk]
+    merged = single_junction[walk] & (came_from != -1)
+    merged[merged] = ~single_junction[came_from[merged]]
+    segment_of = np.full(component_count, -1, dtype=np.int32)
+    segment_of[walk[~merged]] = np.arange(np.count_nonzero(~merged), dtype=np.int32)
+    segment_of[walk[merged]] = segment_of[came_from[merged]]
+    kept = walk[~merged]
+    parents = np.where(came_from[~merged] == -1, -1, segment_of[np.maximum(came_from[~merged], 0)])
+    entries = [divmod(cell, cols) for cell in np.array(entry, dtype=np.int64)[kept].tolist()]
+
+    # anything cut off from the start is still its own segment, just not part of the tree
+    unreached = np.flatnonzero(segment_of == -1)
+    segment_of[unreached] = np.arange(len(kept), len(kept) + len(unreached), dtype=np.int32)
+    parents = np.concatenate((parents, np.full(len(unreached), -1))).astype(np.int32)
+    entries += [divmod(cell, cols) for cell in component_ids[unreached].tolist()]
+
+    labels = np.full(rows * cols, -1, dtype=np.int32)
+    labels[open_ids] = segment_of[component]
+    return labels.reshape(rows, cols), parents, entries
+
+
+def segment_palette(count):
+    # count distinct RGB colors as a (count, 3) uint8 array; hues step by the golden ratio so
+    # consecutive labels land far apart on the color wheel, saturation and value cycle too
+    index = np.arange(count)
+    hue = (index * 0.6180339887) % 1.0 * 6
+    saturation = 0.55 + 0.15 * (index % 3)
+    value = 0.95 - 0.15 * (index // 3 % 2)
+
+    sector = hue.astype(int) % 6
+    fraction = hue - np.floor(hue)
+    low = value * (1 - saturation)
+    falling = value * (1 - fraction * saturation)
+    rising = value * (1 - (1 - fraction) * saturation)
+    red = np.choose(sector, [value, falling, low, low, rising, value])
+    green = np.choose(sector, [rising, value, value, falling, low, low])
+    blue = np.choose(sector, [low, low, rising, value, value, falling])
+    return np.round(np.stack([red, green, blue], axis=1) * 255).astype(np.uint8)
@@ -0,0 +1,503 @@
+import heapq
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from maze_cells import PaddedGrid, padded_id, unpad
+from maze_graph import JunctionGraph
+from maze_history import ExplorationHistory
+
+# Every solver here is a generator over the grid (0 = open, 1 = wall). Each value it yields
+# is one expansion step: (current cell, newly visited cells, cells added to the frontier,
+# cells removed from the frontier), with cells given as maze_cells.PaddedGrid ids so that the
+# solvers keep their state in flat arrays rather than dicts and sets of tuples. When it
+# finishes it returns the path as a list of (row, col) cells from start to end (empty if
+# there is none). run_solver records the steps into an ExplorationHistory so every algorithm
+# shares the same playback path. The "Graph" solvers search maze_graph.JunctionGraph instead,
+# so their steps only visit junctions and dead ends, but they still return the full path of
+# cells.
+
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+DIR_NAMES = ["UP", "RIGHT", "DOWN", "LEFT"]
+
+
+def is_open(grid, row, col):
+    return 0 <= row < len(grid) and 0 <= col < len(grid[0]) and grid[row][col] == 0
+
+
+def open_neighbors(grid, row, col):
+    for dr, dc in DIRECTIONS:
+        if is_open(grid, row + dr, col + dc):
+            yield row + dr, col + dc
+
+
+def cell_cost(weights, cell):
+    # cost of stepping into a cell; unweighted mazes cost 1 per move
+    return 1 if weights is None else weights[cell[0]][cell[1]]
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def build_path(parents, end):
+    path = [end]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def path_to_moves(path):
+    # turn consecutive cells into the "UP"/"RIGHT"/"DOWN"/"LEFT" moves used by the player
+    moves = []
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        moves.append(DIR_NAMES[DIRECTIONS.index((next_row - row, next_col - col))])
+    return moves
+
+
+def solve_bfs(grid, start, end, weights=None):
+    cells = PaddedGrid(grid)
+    is_open, offsets = cells.open, cells.offsets
+    source, target = cells.flat(start), cells.flat(end)
+    parent = cells.filled(-1)
+    parent[source] = source
+    queue = deque([source])
+    yield source, [source], [source], []
+
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            return cells.path(parent, target)
+
+        frontier = []
+        for offset in offsets:
+            neighbor = current + offset
+            if is_open[neighbor] and parent[neighbor] == -1:
+                parent[neighbor] = current
+                queue.append(neighbor)
+                frontier.append(neighbor)
+        yield current, frontier, frontier, [current]
+    return []
+
+
+def solve_dfs(grid, start, end, weights=None):
+    cells = PaddedGrid(grid)
+    is_open, offsets = cells.open, cells.offsets
+    source, target = cells.flat(start), cells.flat(end)
+    parent = cells.filled(-1)
+    parent[source] = source
+    stack = [source]
+    yield source, [source], [source], []
+
+    while stack:
+        current = stack.pop()  # DFS uses a stack (pop from end)
+        if current == target:
+            return cells.path(parent, target)
+
+        frontier = [current + offset for offset in offsets
+                    if is_open[current + offset] and parent[current + offset] == -1]
+        # push in reverse order to prioritize UP, RIGHT, DOWN, LEFT
+        for neighbor in reversed(frontier):
+            parent[neighbor] = current
+            stack.append(neighbor)
+        yield current, frontier, frontier, [current]
+    return []
+
+
+def _best_first(grid, start, end, weights, heuristic):
+    # shared body of Dijkstra (heuristic 0) and A*; stale heap entries are skipped lazily.
+    # ties on f are broken towards the smaller heuristic, i.e. the node closer to the goal.
+    # heuristic takes a padded id
+    cells = PaddedGrid(grid, weights)
+    is_open, offsets, costs = cells.open, cells.offsets, cells.costs
+    source, target = cells.flat(start), cells.flat(end)
+    cost = cells.filled(-1, "q")  # -1 until the cell is reached
+    parent = cells.filled(-1)
+    closed = bytearray(cells.size)
+    cost[source] = 0
+    parent[source] = source
+    heap = [(heuristic(source), heuristic(source), 0, source)]
+    yield source, [source], [source], []
+
+    while heap:
+        _, _, current_cost, current = heapq.heappop(heap)
+        if closed[current] or current_cost > cost[current]:
+            continue
+        closed[current] = 1
+        if current == target:
+            return cells.path(parent, target)
+
+        visited, frontier = [], []
+        for offset in offsets:
+            neighbor = current + offset
+            if not is_open[neighbor] or closed[neighbor]:
+                continue
+            new_cost = current_cost + (1 if costs is None else costs[neighbor])
+            if cost[neighbor] == -1:
+                visited.append(neighbor)
+                frontier.append(neighbor)
+            elif new_cost >= cost[neighbor]:
+                continue
+            cost[neighbor] = new_cost
+            parent[neighbor] = current
+            estimate = heuristic(neighbor)
+            heapq.heappush(heap, (new_cost + estimate, estimate, new_cost, neighbor))
+        yield current, visited, frontier, [current]
+    return []
+
+
+def solve_dijkstra(grid, start, end, weights=None):
+    return (yield from _best_first(grid, start, end, weights, lambda cell: 0))
+
+
+def solve_astar(grid, start, end, weights=None):
+    # Manhattan distance scaled by the cheapest move stays admissible on weighted cells
+    min_cost = 1 if weights is None else min(
+        weights[row][col] for row in range(len(grid)) for col in range(len(grid[0])) if grid[row][col] == 0)
+    width = len(grid[0]) + 1
+    end_row, end_col = divmod(padded_id(end, len(grid[0])), width)
+
+    def heuristic(cell):
+        return min_cost * (abs(cell // width - end_row) + abs(cell % width - end_col))
+    return (yield from _best_first(grid, start, end, weights, heuristic))
+
+
+def solve_bidirectional_bfs(grid, start, end, weights=None):
+    # grow a BFS from each end, always expanding a full level of the smaller side, and stop
+    # after the level in which the two searches first meet
+    cells = PaddedGrid(grid)
+    is_open, offsets = cells.open, cells.offsets
+    source, target = cells.flat(start), cells.flat(end)
+    queues = (deque([source]), deque([target]))
+    parents = (cells.filled(-1), cells.filled(-1))
+    depth = (cells.filled(-1), cells.filled(-1))  # -1 until the side reaches the cell
+    parents[0][source], parents[1][target] = source, target
+    depth[0][source] = depth[1][target] = 0
+    yield source, [source, target], [source, target], []
+    if source == target:
+        return [tuple(start)]
+
+    best = None
+    while queues[0] and queues[1] and best is None:
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        queue, own, other, parent = queues[side], depth[side], depth[1 - side], parents[side]
+        for _ in range(len(queue)):
+            current = queue.popleft()
+            frontier = []
+            for offset in offsets:
+                neighbor = current + offset
+                if not is_open[neighbor] or own[neighbor] != -1:
+                    continue
+                own[neighbor] = own[current] + 1
+                parent[neighbor] = current
+                queue.append(neighbor)
+                frontier.append(neighbor)
+                if other[neighbor] != -1:
+                    length = own[neighbor] + other[neighbor]
+                    if best is None or length < best[0]:
+                        best = (length, neighbor)
+            yield current, frontier, frontier, [current]
+
+    if best is None:
+        return []
+    meet = best[1]
+    forward = cells.path(parents[0], meet)
+    backward = cells.path(parents[1], meet)
+    return forward + backward[-2::-1]
+
+
+def solve_jps(grid, start, end, weights=None):
+    # Jump point search for 4-connected grids. Horizontal moves are taken as early as
+    # possible, so a vertical run only needs to stop where a horizontal turn is forced (the
+    # cell beside it was blocked one step back), and a horizontal run stops wherever a
+    # vertical scan from it reaches a jump point. Only jump points enter the open list.
+    scanned = []
+
+    def forced_turns(row, col, dr):
+        return [dc for dc in (-1, 1)
+                if is_open(grid, row, col + dc) and not is_open(grid, row - dr, col + dc)]
+
+    def jump_vertical(row, col, dr):
+        while True:
+            row += dr
+            if not is_open(grid, row, col):
+                return None
+            scanned.append((row, col))
+            if (row, col) == end or forced_turns(row, col, dr):
+                return row, col
+
+    def jump_horizontal(row, col, dc):
+        while True:
+            col += dc
+            if not is_open(grid, row, col):
+                return None
+            scanned.append((row, col))
+            if (row, col) == end:
+                return row, col
+            if jump_vertical(row, col, -1) or jump_vertical(row, col, 1):
+                return row, col
+
+    def successor_directions(cell, parent):
+        if parent is None:
+            return DIRECTIONS
+        dr = (cell[0] > parent[0]) - (cell[0] < parent[0])
+        dc = (cell[1] > parent[1]) - (cell[1] < parent[1])
+        if dc:
+            return [(0, dc), (-1, 0), (1, 0)]
+        return [(dr, 0)] + [(0, turn) for turn in forced_turns(cell[0], cell[1], dr)]
+
+    cost = {start: 0}
+    parents = {start: None}
+    closed = set()
+    seen = {start}
+    heap = [(manhattan(start, end), 0, start)]
+    cols = len(grid[0])
+    yield padded_id(start, cols), [padded_id(start, cols)], [padded_id(start, cols)], []
+
+    while heap:
+        _, current_cost, current = heapq.heappop(heap)
+        if current in closed or current_cost > cost[current]:
+            continue
+        closed.add(current)
+        if current == end:
+            break
+
+        scanned.clear()
+        frontier = []
+        for dr, dc in successor_directions(current, parents[current]):
+            if dr:
+                jump_point = jump_vertical(current[0], current[1], dr)
+            else:
+                jump_point = jump_horizontal(current[0], current[1], dc)
+            if jump_point is None or jump_point in closed:
+                continue
+            new_cost = current_cost + manhattan(current, jump_point)
+            if jump_point in cost and new_cost >= cost[jump_point]:
+                continue
+            if jump_point not in cost:
+                frontier.append(jump_point)
+            cost[jump_point] = new_cost
+            parents[jump_point] = current
+            heapq.heappush(heap, (new_cost + manhattan(jump_point, end), new_cost, jump_point))
+        visited = [cell for cell in dict.fromkeys(scanned) if cell not in seen]
+        seen.update(visited)
+        yield (padded_id(current, cols), [padded_id(cell, cols) for cell in visited],
+               [padded_id(cell, cols) for cell in frontier], [padded_id(current, cols)])
+    else:
+        return []
+
+    # fill in the straight runs between consecutive jump points
+    path = [start]
+    for jump_point in build_path(parents, end)[1:]:
+        row, col = path[-1]
+        dr = (jump_point[0] > row) - (jump_point[0] < row)
+        dc = (jump_point[1] > col) - (jump_point[1] < col)
+        while (row, col) != jump_point:
+            row, col = row + dr, col + dc
+            path.append((row, col))
+    return path
+
+
+def _graph_path(graph, parents, node):
+    # parents maps each reached node to (previous node, edge taken), None for the source
+    edges = []
+    while parents[node] is not None:
+        node, edge = parents[node]
+        edges.append(edge)
+    edges.reverse()
+    return graph.expand(node, edges)
+
+
+def _padded_nodes(graph):
+    # padded id (see maze_cells.PaddedGrid) of every node, the ids graph solvers step through
+    row, col = np.divmod(graph.nodes.astype(np.int64), graph.cols)
+    return ((row + 1) * (graph.cols + 1) + col).tolist()
+
+
+def solve_graph_bfs(grid, start, end, weights=None):
+    # BFS over the junction graph: one step per node, so the corridors are crossed in one
+    # go. It finds the route through the fewest corridors, which is the shortest one in a
+    # maze without loops (there the route is unique)
+    graph = JunctionGraph(grid, start, end, weights)
+    edge_ptr, edge_to = graph.edge_ptr.tolist(), graph.edge_to.tolist()
+    node_ids = _padded_nodes(graph)
+    source, target = graph.node_at(start), graph.node_at(end)
+    queue = deque([source])
+    parents = {source: None}
+    yield node_ids[source], [node_ids[source]], [node_ids[source]], []
+
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            return _graph_path(graph, parents, target)
+
+        frontier = []
+        for edge in range(edge_ptr[current], edge_ptr[current + 1]):
+            neighbor = edge_to[edge]
+            if neighbor not in parents:
+                parents[neighbor] = (current, edge)
+                queue.append(neighbor)
+                frontier.append(node_ids[neighbor])
+        yield node_ids[current], frontier, frontier, [node_ids[current]]
+    return []
+
+
+def _graph_best_first(grid, start, end, weights, heuristic):
+    # _best_first over the junction graph; an edge costs its corridor cells plus the node
+    # it leads to, so path costs are the same as on the grid
+    graph = JunctionGraph(grid, start, end, weights)
+    edge_ptr, edge_to = graph.edge_ptr.tolist(), graph.edge_to.tolist()
+    node_ids = _padded_nodes(graph)
+    edge_cost, node_cost = graph.edge_cost.tolist(), graph.node_cost.tolist()
+    source, target = graph.node_at(start), graph.node_at(end)
+    cost = {source: 0}
+    parents = {source: None}
+    closed = set()
+    heap = [(heuristic(start), heuristic(start), 0, source)]
+    yield node_ids[source], [node_ids[source]], [node_ids[source]], []
+
+    while heap:
+        _, _, current_cost, current = heapq.heappop(heap)
+        if current in closed or current_cost > cost[current]:
+            continue
+        closed.add(current)
+        if current == target:
+            return _graph_path(graph, parents, target)
+
+        visited, frontier = [], []
+        for edge in range(edge_ptr[current], edge_ptr[current + 1]):
+            neighbor = edge_to[edge]
+            if neighbor in closed:
+                continue
+            new_cost = current_cost + edge_cost[edge] + node_cost[neighbor]
+            if neighbor not in cost:
+                visited.append(node_ids[neighbor])
+                frontier.append(node_ids[neighbor])
+            elif new_cost >= cost[neighbor]:
+                continue
+            cost[neighbor] = new_cost
+            parents[neighbor] = (current, edge)
+            estimate = heuristic(graph.cell(neighbor))
+            heapq.heappush(heap, (new_cost + estimate, estimate, new_cost, neighbor))
+        yield node_ids[current], visited, frontier, [node_ids[current]]
+    return []
+
+
+def solve_graph_dijkstra(grid, start, end, weights=None):
+    return (yield from _graph_best_first(grid, start, end, weights, lambda cell: 0))
+
+
+def solve_graph_astar(grid, start, end, weights=None):
+    min_cost = 1 if weights is None else min(
+        weights[row][col] for row in range(len(grid)) for col in range(len(grid[0])) if grid[row][col] == 0)
+    return (yield from _graph_best_first(grid, start, end, weights, lambda cell: min_cost * manhattan(cell, end)))
+
+
+SOLVERS = {
+    "BFS": solve_bfs,
+    "DFS": solve_dfs,
+    "A*": solve_astar,
+    "Dijkstra": solve_dijkstra,
+    "BiBFS": solve_bidirectional_bfs,
+    "JPS": solve_jps,
+    "Graph BFS": solve_graph_bfs,
+    "Graph Dijkstra": solve_graph_dijkstra,
+    "Graph A*": solve_graph_astar,
+}
+
+
+def step_batches(steps, cols, batch_size=256):
+    # group the steps of a solver generator into ExplorationHistory.record_batch arguments
+    # (flat-id arrays of the unpadded grid), batch_size steps at a time; returns the path
+    # like the solver
+    while True:
+        current, counts = [], ([], [], [])
+        ids = ([], [], [])
+        try:
+            while len(current) < batch_size:
+                cell, *deltas = next(steps)
+                current.append(cell)
+                for cells, step_ids, step_counts in zip(deltas, ids, counts):
+                    step_ids.extend(cells)
+                    step_counts.append(len(cells))
+        except StopIteration as done:
+            path = done.value
+        else:
+            path = None
+        if current:
+            yield (unpad(current, cols),
+                   unpad(ids[0], cols), np.array(counts[0], dtype=np.int32),
+                   unpad(ids[1], cols), np.array(counts[1], dtype=np.int32),
+                   unpad(ids[2], cols), np.array(counts[2], dtype=np.int32))
+        if path is not None:
+            return path
+
+
+def run_solver(name, grid, start, end, weights=None):
+    # returns (path cells, exploration history); nodes expanded is len(history) - 1
+    history = ExplorationHistory(len(grid), len(grid[0]))
+    batches = step_batches(SOLVERS[name](grid, tuple(start), tuple(end), weights), len(grid[0]))
+    while True:
+        try:
+            history.record_batch(*next(batches))
+        except StopIteration as done:
+            return done.value, history
+
+
+class SolverThread(threading.Thread):
+    """Runs a solver in the background and streams its steps to the UI.
+
+    Batches of steps go through a bounded queue: when the UI falls behind, the solver waits
+    for it instead of piling up steps, so memory stays bounded. The UI thread calls
+    ``receive`` to move whatever has arrived into its ExplorationHistory; ``path`` is set
+    once the solver has finished.
+    """
+
+    def __init__(self, name, grid, start, end, weights=None, batch_size=256, max_batches=16):
+        super().__init__(daemon=True)
+        self.steps = SOLVERS[name](grid, tuple(start), tuple(end), weights)
+        self.cols = len(grid[0])
+        self.batch_size = batch_size
+        self.batches = queue.Queue(max_batches)
+        self.path = None
+        self._cancelled = threading.Event()
+
+    def run(self):
+        batches = step_batches(self.steps, self.cols, self.batch_size)
+        while True:
+            try:
+                item = ("steps", next(batches))
+            except StopIteration as done:
+                item = ("path", done.value)
+            # wait for room in the queue, giving up if the solve is cancelled meanwhile
+            while not self._cancelled.is_set():
+                try:
+                    self.batches.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if self._cancelled.is_set() or item[0] == "path":
+                return
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def finished(self):
+        return self.path is not None
+
+    def receive(self, history, deadline=None):
+        # record the batches that have arrived, stopping at the time.perf_counter() deadline
+        while self.path is None and (deadline is None or time.perf_counter() < deadline):
+            try:
+                kind, value = self.batches.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "path":
+                self.path = value
+            else:
+                history.record_batch(*value)
@@ -0,0 +1,131 @@
+# Tidy tree layout (Reingold-Tilford, in the linear-time form of Walker's algorithm given by
+# Buchheim, Juenger and Leipert) for trees where every node has any number of children.
+# Works on any node objects with a `children` list and is written without recursion, so
+# deep corridor trees from large mazes lay out as easily as small ones.
+
+
+def tidy_layout(root, distance=1.0):
+    """Returns (nodes, x, depth, left, right) with nodes in pre-order.
+
+    x[i] is the horizontal position of nodes[i] (the root is at 0), depth[i] its level, and
+    left[i]/right[i] the horizontal extent of its whole subtree. Neighbouring nodes on a
+    level are at least `distance` apart and parents sit centered over their children.
+    """
+    # number the nodes in pre-order and keep every per-node value in flat lists
+    nodes = []
+    index = {}
+    parent = []
+    depth = []
+    stack = [(root, -1, 0)]
+    while stack:
+        node, parent_index, level = stack.pop()
+        index[id(node)] = len(nodes)
+        nodes.append(node)
+        parent.append(parent_index)
+        depth.append(level)
+        for child in reversed(node.children):
+            stack.append((child, index[id(node)], level + 1))
+    count = len(nodes)
+    children = [[index[id(child)] for child in node.children] for node in nodes]
+    number = [0] * count  # position among the siblings
+    for kids in children:
+        for position, child in enumerate(kids):
+            number[child] = position
+
+    prelim = [0.0] * count
+    mod = [0.0] * count
+    shift = [0.0] * count
+    change = [0.0] * count
+    midpoint = [0.0] * count
+    thread = [-1] * count
+    ancestor = list(range(count))
+
+    def next_left(v):
+        return children[v][0] if children[v] else thread[v]
+
+    def next_right(v):
+        return children[v][-1] if children[v] else thread[v]
+
+    def move_subtree(left_subtree, right_subtree, amount):
+        subtrees = number[right_subtree] - number[left_subtree]
+        change[right_subtree] -= amount / subtrees
+        shift[right_subtree] += amount
+        change[left_subtree] += amount / subtrees
+        prelim[right_subtree] += amount
+        mod[right_subtree] += amount
+
+    def apportion(v, left_sibling, default_ancestor):
+        # push the subtree of v right until it clears every subtree to its left
+        inner_right = outer_right = v
+        inner_left = left_sibling
+        outer_left = children[parent[v]][0]
+        sum_inner_right, sum_outer_right = mod[inner_right], mod[outer_right]
+        sum_inner_left, sum_outer_left = mod[inner_left], mod[outer_left]
+        while next_right(inner_left) != -1 and next_left(inner_right) != -1:
+            inner_left = next_right(inner_left)
+            inner_right = next_left(inner_right)
+            outer_left = next_left(outer_left)
+            outer_right = next_right(outer_right)
+            ancestor[outer_right] = v
+            gap = (prelim[inner_left] + sum_inner_left) - (prelim[inner_right] + sum_inner_right) + distance
+            if gap > 0:
+                greatest = ancestor[inner_left]
+                if parent[greatest] != parent[v]:
+                    greatest = default_ancestor
+                move_subtree(greatest, v, gap)
+                sum_inner_right += gap
+                sum_outer_right += gap
+            sum_inner_left += mod[inner_left]
+            sum_inner_right += mod[inner_right]
+            sum_outer_left += mod[outer_left]
+            sum_outer_right += mod[outer_right]
+        if next_right(inner_left) != -1 and next_right(outer_right) == -1:
+            thread[outer_right] = next_right(inner_left)
+            mod[outer_right] += sum_inner_left - sum_outer_right
+        if next_left(inner_right) != -1 and next_left(outer_left) == -1:
+            thread[outer_left] = next_left(inner_right)
+            mod[outer_left] += sum_inner_right - sum_outer_left
+            default_ancestor = v
+        return default_ancestor
+
+    # first walk: post-order (reverse pre-order visits children before parents)
+    for v in range(count - 1, -1, -1):
+        kids = children[v]
+        if not kids:
+            continue
+        default_ancestor = kids[0]
+        for position, w in enumerate(kids):
+            if position == 0:
+                prelim[w] = midpoint[w]
+            else:
+                prelim[w] = prelim[kids[position - 1]] + distance
+                if children[w]:
+                    mod[w] = prelim[w] - midpoint[w]
+                default_ancestor = apportion(w, kids[position - 1], default_ancestor)
+        # execute the shifts collected by move_subtree
+        total_shift = total_change = 0.0
+        for w in reversed(kids):
+            prelim[w] += total_shift
+            mod[w] += total_shift
+            total_change += change[w]
+            total_shift += shift[w] + total_change
+        midpoint[v] = (prelim[kids[0]] + prelim[kids[-1]]) / 2
+    prelim[0] = midpoint[0]
+
+    # second walk: pre-order, adding up the modifiers of the ancestors
+    x = [0.0] * count
+    modifier_sum = [0.0] * count
+    for v in range(count):
+        x[v] = prelim[v] + modifier_sum[v]
+        for w in children[v]:
+            modifier_sum[w] = modifier_sum[v] + mod[v]
+    root_x = x[0]
+    x = [position - root_x for position in x]
+
+    # subtree extents, used to skip subtrees that are off screen
+    left, right = x[:], x[:]
+    for v in range(count - 1, 0, -1):
+        p = parent[v]
+        left[p] = min(left[p], left[v])
+        right[p] = max(right[p], right[v])
+    return nodes, x, depth, left, right